@@ -1,10 +1,18 @@
 import math
+import os
 import sys
 from itertools import combinations, product
 from multiprocessing import Pool
 import time
 
 
+# Razred Stats je skupen vsem vajam (stats.py v korenu repozitorija)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stats import Stats
+
+STATS = Stats()
+
+
 def preberi_dnk(filename):
     with open(filename, "r") as f:
         return f.read().strip()
@@ -13,20 +21,24 @@ def preberi_dnk(filename):
 def poisci_reze(dnk_SEQ, encim_mesto):
     indeksi = []
 
-    for zaporedje in encim_mesto:
-        i = dnk_SEQ.find(zaporedje)
-        while i != -1:
-            indeksi.append(i)
-            i = dnk_SEQ.find(zaporedje, i + 1)
+    with STATS.phase("rezi"):
+        for zaporedje in encim_mesto:
+            i = dnk_SEQ.find(zaporedje)
+            while i != -1:
+                indeksi.append(i)
+                i = dnk_SEQ.find(zaporedje, i + 1)
 
-    indeksi.sort()
+        indeksi.sort()
+    STATS.add("rezi.najdeni", len(indeksi))
     return indeksi
 
 
 def izracunaj_razdalje(indeksi, dolzina_dnk):
     vsi_rezi = [0] + indeksi + [dolzina_dnk - 1]
-    razdalje = [abs(a - b) for a, b in combinations(vsi_rezi, 2)]
-    razdalje.sort()
+    with STATS.phase("razdalje"):
+        razdalje = [abs(a - b) for a, b in combinations(vsi_rezi, 2)]
+        razdalje.sort()
+    STATS.add("razdalje.pari", len(razdalje))
     return razdalje
 
 
@@ -36,16 +48,21 @@ def brute_force(L):
     set_L = set(L)
 
     resitve = set()
+    kandidati = 0
 
-    for subset in combinations(L, n - 2):
-        # if len(subset) > n-2: continue
-        X = {0, *subset, M}
-        dX = {abs(a - b) for a, b in combinations(X, 2)}
+    with STATS.phase("brute_force.resevanje"):
+        for subset in combinations(L, n - 2):
+            # if len(subset) > n-2: continue
+            kandidati += 1
+            X = {0, *subset, M}
+            dX = {abs(a - b) for a, b in combinations(X, 2)}
 
-        if dX == set_L:
-            resitve.add(frozenset(X))
-            # if len(resitve) > 1: return resitve
+            if dX == set_L:
+                resitve.add(frozenset(X))
+                # if len(resitve) > 1: return resitve
 
+    STATS.add("brute_force.kandidati", kandidati)
+    STATS.add("brute_force.resitve", len(resitve))
     return resitve
 
 
@@ -64,9 +81,10 @@ def brute_force_multi(L):
     set_L = set(L)
 
     subsets = combinations(L, n - 2)
-    with Pool(8) as pool:
+    with STATS.phase("brute_force.resevanje"), Pool(8) as pool:
         resitve = set(pool.starmap(process_subset, [(subset, M, set_L) for subset in subsets]))
 
+    STATS.add("brute_force.kandidati", math.comb(len(L), n - 2))
     return resitve
 
 
@@ -75,8 +93,11 @@ def partial_digest(L):
     L.pop()
     X = {0, sirina}
     rezultat = set()
+    klici = veje = rezi = 0     # klici place, sprejeti kandidati y, zavrnjeni kandidati y
 
     def place(l, x):
+        nonlocal klici, veje, rezi
+        klici += 1
         if not l or len(l) == 0:
             rezultat.add(frozenset(x))
             return
@@ -106,21 +127,32 @@ def partial_digest(L):
 
         dyX = [abs(y - xi) for xi in x]
         if checkSubset(dyX, l):
+            veje += 1
             x.add(y)
             for z in dyX: l.remove(z)
             place(l, x)
             x.remove(y)
             for z in dyX: l.append(z)
+        else:
+            rezi += 1
 
         dyX = [abs((sirina - y) - xi) for xi in x]
         if checkSubset(dyX, l):
+            veje += 1
             x.add(sirina - y)
             for z in dyX: l.remove(z)
             place(l, x)
             x.remove(sirina - y)
             for z in dyX: l.append(z)
-
-    place(L, X)
+        else:
+            rezi += 1
+
+    with STATS.phase("partial_digest.resevanje"):
+        place(L, X)
+    STATS.add("partial_digest.klici", klici)
+    STATS.add("partial_digest.veje", veje)
+    STATS.add("partial_digest.rezi", rezi)
+    STATS.add("partial_digest.resitve", len(rezultat))
     return rezultat
 
 
@@ -147,6 +179,10 @@ def poisci_reze_and_log(dnk_seq, filename="results.txt"):
 
 
 if __name__ == "__main__":
+    if "--stats" in sys.argv:
+        sys.argv.remove("--stats")
+        STATS.enabled = True
+
     if len(sys.argv) < 2:
         print("Podaj ime datoteke z DNK zaporedjem: ")
         ime_datoteke = input()
@@ -211,6 +247,10 @@ if __name__ == "__main__":
     print("Rešitev: ")
     for r in resitev: print("  ", sorted(r))
 
+    if STATS.enabled:
+        print("Opravljeno delo:")
+        print(STATS.report())
+
     # Output to file
     # with open("output.txt", "w") as file:
     # file.write(f"Zaporedje: {ime_datoteke}, Mesto reza: {mesto}, Čas izvajanja: {diff:.2f} s\n")
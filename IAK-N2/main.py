@@ -1,16 +1,25 @@
+import os
 import sys
 import numpy as np
 import random
 import time
 
 
+# Stats lives in stats.py at the repository root, shared by every exercise
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stats import Stats
+
+STATS = Stats()
+
+
 def readFileData(filename_string):
-    with open(filename_string, 'r') as file:
+    with STATS.phase("read"), open(filename_string, 'r') as file:
         data = file.readlines()
 
     return [int(x.strip()) for x in data]
 
 
+@STATS.timed("simple.sort")
 def simpleReversalSort(data):
     rotations = 0
     for i in range(len(data) - 1):
@@ -22,6 +31,7 @@ def simpleReversalSort(data):
             # print(data)
         if all(data[i] == i + 1 for i in range(len(data))):
             print("Rotations made:", rotations)
+            STATS.add("simple.reversals", rotations)
             return data
 
 
@@ -154,10 +164,14 @@ def update_ordered_strips(data, ascending_strips, descending_strips, single_item
     return ascending_strips, descending_strips, single_item_strips, index_to_strip
 
 
+@STATS.timed("breakpoint.sort")
 def improvedBreakpointReversalSort(data, heuristic=1):
     rotations = 0
-    breakpoints = getBreakpoints(data)  # Initial calculation of all breakpoints
-    ascending_strips, descending_strips, single_item_strips, index_to_strip = find_ordered_strips(data, breakpoints)
+    updates = idle = 0
+    with STATS.phase("breakpoint.strips"):
+        breakpoints = getBreakpoints(data)  # Initial calculation of all breakpoints
+        ascending_strips, descending_strips, single_item_strips, index_to_strip = find_ordered_strips(data, breakpoints)
+    STATS.add("breakpoint.initial_breakpoints", len(breakpoints))
 
     while breakpoints:
         # print(len(breakpoints))
@@ -165,6 +179,8 @@ def improvedBreakpointReversalSort(data, heuristic=1):
         if not descending_strips:
             if not ascending_strips:
                 print("No Ascending or Descending Strips")
+                STATS.add("breakpoint.reversals", rotations)
+                STATS.add("breakpoint.strip_updates", updates)
                 return data
 
             # Choose the last ascending strip
@@ -226,9 +242,11 @@ def improvedBreakpointReversalSort(data, heuristic=1):
             end_idx = index
             data[start_idx:end_idx + 1] = list(reversed(data[start_idx:end_idx + 1]))
         else:
+            idle += 1
             continue
 
         # Update only the affected breakpoints and strips
+        updates += 1
         breakpoints = update_breakpoints(data, breakpoints, start_idx, end_idx)
         ascending_strips, descending_strips, single_item_strips, index_to_strip = update_ordered_strips(
             data, ascending_strips, descending_strips, single_item_strips,
@@ -237,6 +255,9 @@ def improvedBreakpointReversalSort(data, heuristic=1):
         rotations += 1
 
     print("Rotations made:", rotations)
+    STATS.add("breakpoint.reversals", rotations)
+    STATS.add("breakpoint.strip_updates", updates)
+    STATS.add("breakpoint.idle_iterations", idle)
     return data
 
 
@@ -287,6 +308,9 @@ def getTimes():
 
 
 if __name__ == '__main__':
+    if "--stats" in sys.argv:
+        sys.argv.remove("--stats")
+        STATS.enabled = True
 
     # getTimes()
     # exit(0)
@@ -322,3 +346,7 @@ if __name__ == '__main__':
     # print("Improved Own Implementation Time taken:", (time.time() - start) * 1000, "ms")
     # print("Correctly Sorted:", all(improvedOwnData[i] == i + 1 for i in range(len(improvedOwnData))))
     # print("Improved Own Implementation:\n", improvedOwnData)
+
+    if STATS.enabled:
+        print("Work done:")
+        print(STATS.report("phase"))
@@ -1,10 +1,24 @@
+import atexit
+import hashlib
+import json
+import multiprocessing
+import os
 import time
-from typing import List, Tuple, Any
+from collections import deque
+from multiprocessing.connection import wait
+from typing import List, Tuple, Any, Optional
 import numpy as np
 import sys
 from itertools import product
 
 
+# Stats is shared by all exercises in stats.py at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stats import Stats
+
+STATS = Stats()
+
+
 def read_dna_file(filename: str) -> str:
     with open(filename, 'r') as file:
         return file.read().strip()
@@ -14,6 +28,77 @@ def get_nmers(dna: str, n: int, t: int) -> List[str]:
     return [dna[i:i + n] for i in range(0, t * n, n)]
 
 
+def is_fasta_file(filename: str) -> bool:
+    with open(filename, 'r') as file:
+        for line in file:
+            if line.strip():
+                return line.startswith('>')
+    return False
+
+
+class FastaSequences:
+    # Lazy view of a multi-FASTA file: a single pass records where every sequence
+    # starts, and sequences are read and encoded only when an engine asks for them.
+
+    def __init__(self, filename: str, n=None, t: int = None, cache_size: int = 64):
+        self.filename = filename
+        self.names = []
+        self._sections = []  # (byte offset, byte length) of every record's sequence lines
+        self._cache = {}
+        self.cache_size = cache_size
+
+        with open(filename, 'rb') as file:
+            offset, start = 0, None
+            for line in file:
+                if line.startswith(b'>'):
+                    if start is not None:
+                        self._sections.append((start, offset - start))
+                        start = None
+                    if t is not None and len(self.names) == t:
+                        break
+                    self.names.append(line[1:].strip().decode())
+                    start = offset + len(line)
+                offset += len(line)
+            if start is not None:
+                self._sections.append((start, offset - start))
+
+        # n is None (whole records), one length for all records, or one per record
+        if n is None or isinstance(n, int):
+            self.lengths = [n] * len(self.names)
+        else:
+            self.lengths = list(n)
+            if len(self.lengths) != len(self.names):
+                raise ValueError(f"Got {len(self.lengths)} lengths for {len(self.names)} sequences")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        if i in self._cache:
+            return self._cache[i]
+
+        start, size = self._sections[i]
+        with open(self.filename, 'rb') as file:
+            file.seek(start)
+            sequence = file.read(size).translate(None, b" \t\r\n")
+
+        n = self.lengths[i]
+        if n is not None:
+            if len(sequence) < n:
+                raise ValueError(f"Sequence '{self.names[i]}' is shorter than n={n}")
+            sequence = sequence[:n]
+        codes = encode_dna(sequence)
+
+        if len(self._cache) >= self.cache_size:
+            del self._cache[next(iter(self._cache))]
+        self._cache[i] = codes
+        return codes
+
+
 def get_profile(motifs: List[str], l: int) -> np.ndarray:
     profile = np.zeros((4, l))
 
@@ -47,10 +132,11 @@ def get_consensus(motifs: List[str]) -> str:
     l = len(motifs[0])
     profile = get_profile(motifs, l)
 
-    # For each position, find the most frequent nucleotide
-    nucleotides = ['A', 'T', 'G', 'C']
+    # For each position, find the most frequent nucleotide; ties go to the first
+    # one in A, C, G, T order, the order branch and bound enumerates patterns in
+    nucleotides = ['A', 'C', 'G', 'T']
     for j in range(l):
-        max_idx = np.argmax(profile[:, j])
+        max_idx = np.argmax(profile[PROFILE_ROWS, j])
         consensus += nucleotides[max_idx]
 
     return consensus
@@ -64,6 +150,7 @@ def greedy_motif_search(dna: str, n: int, l: int, t: int) -> Tuple[List[int], st
     best_motifs = []
     best_starts = []
 
+    candidates = 0
     # For each possible starting position in the first n-mer
     for start1 in range(n - l + 1):
         motifs = [nmers[0][start1:start1 + l]]
@@ -76,6 +163,7 @@ def greedy_motif_search(dna: str, n: int, l: int, t: int) -> Tuple[List[int], st
             best_motif = ""
             best_start = 0
 
+            candidates += n - l + 1
             for start in range(n - l + 1):
                 current_motif = nmers[i][start:start + l]
                 current_motifs = motifs + [current_motif]
@@ -95,6 +183,7 @@ def greedy_motif_search(dna: str, n: int, l: int, t: int) -> Tuple[List[int], st
             best_motifs = motifs
             best_starts = starts
 
+    STATS.add("greedy.candidates", candidates)
     consensus = get_consensus(best_motifs)
     return best_starts, consensus, best_score
 
@@ -107,10 +196,12 @@ def recursive_greedy_motif_search(dna: str, n: int, l: int, t: int) -> Tuple[Lis
 
     expected_combinations = (n - l + 1) ** t
     combinations_explored = 0
+    calls = 0
 
     def explore_combinations(index, current_motifs, current_positions):
-        nonlocal best_score, best_motifs, best_positions, combinations_explored
+        nonlocal best_score, best_motifs, best_positions, combinations_explored, calls
 
+        calls += 1
         if index == t:
             combinations_explored += 1
             current_score = score_motifs(current_motifs)
@@ -133,7 +224,10 @@ def recursive_greedy_motif_search(dna: str, n: int, l: int, t: int) -> Tuple[Lis
             )
 
     # Start recursive exploration
-    explore_combinations(0, [], [])
+    with STATS.phase("greedy.search"):
+        explore_combinations(0, [], [])
+    STATS.add("greedy.calls", calls)
+    STATS.add("greedy.leaves", combinations_explored)
 
     # print(f"Explored {combinations_explored}/{expected_combinations} combinations")
     if combinations_explored != expected_combinations:
@@ -142,6 +236,171 @@ def recursive_greedy_motif_search(dna: str, n: int, l: int, t: int) -> Tuple[Lis
     consensus = get_consensus(best_motifs)
     return best_positions, consensus, best_score
 
+# Maps nucleotide codes (A, C, G, T) to the rows of get_profile (A, T, G, C)
+PROFILE_ROWS = np.array([0, 3, 2, 1], dtype=np.uint8)
+
+_POOL_SEQUENCES = None
+
+
+def get_laplace_profile(counts: np.ndarray, t: int) -> np.ndarray:
+    # counts of t motifs as returned by get_profile, plus a pseudocount of 1 per
+    # nucleotide so that no l-mer ever has probability 0
+    return (counts + 1) / (t + 4)
+
+
+def _window_rows(codes: np.ndarray, l: int) -> np.ndarray:
+    # Profile rows of every l-mer window, shape (len(codes) - l + 1, l)
+    if len(codes) < l:
+        raise ValueError(f"Every sequence must be at least l={l} bases long")
+    return PROFILE_ROWS[np.lib.stride_tricks.sliding_window_view(codes, l)]
+
+
+def _profile_counts(sequences: List[np.ndarray], positions: np.ndarray, l: int) -> np.ndarray:
+    # Same counts as get_profile on the motifs at the given positions
+    counts = np.zeros((4, l))
+    columns = np.arange(l)
+    for rows, position in zip(sequences, positions):
+        counts[rows[position], columns] += 1
+    return counts
+
+
+def _window_log_probabilities(rows: np.ndarray, log_profile: np.ndarray) -> np.ndarray:
+    return log_profile[rows, np.arange(rows.shape[1])].sum(axis=1)
+
+
+def _randomized_restart(l: int, seed, max_iterations: int) -> Tuple[int, np.ndarray]:
+    sequences = _POOL_SEQUENCES
+    rng = np.random.default_rng(seed)
+    positions = np.array([rng.integers(len(rows)) for rows in sequences])
+    best_score = int(_profile_counts(sequences, positions, l).max(axis=0).sum())
+
+    # Move every motif to its profile-most-probable l-mer until the score stops improving
+    iterations = 0
+    for _ in range(max_iterations):
+        iterations += 1
+        counts = _profile_counts(sequences, positions, l)
+        log_profile = np.log(get_laplace_profile(counts, len(sequences)))
+        new_positions = np.array([np.argmax(_window_log_probabilities(rows, log_profile)) for rows in sequences])
+        score = int(_profile_counts(sequences, new_positions, l).max(axis=0).sum())
+        if score <= best_score:
+            break
+        best_score, positions = score, new_positions
+
+    STATS.add("randomized.iterations", iterations)
+    return best_score, positions
+
+
+def _gibbs_restart(l: int, seed, max_iterations: int, patience: int) -> Tuple[int, np.ndarray]:
+    sequences = _POOL_SEQUENCES
+    t = len(sequences)
+    columns = np.arange(l)
+    rng = np.random.default_rng(seed)
+    positions = np.array([rng.integers(len(rows)) for rows in sequences])
+    counts = _profile_counts(sequences, positions, l)
+    best_score = int(counts.max(axis=0).sum())
+    best_positions = positions.copy()
+
+    # Resample one motif at a time from the profile of the other t - 1 motifs.
+    # Converged once the best score has not improved for `patience` iterations.
+    stale = iterations = 0
+    for _ in range(max_iterations):
+        iterations += 1
+        i = rng.integers(t)
+        rows = sequences[i]
+        counts[rows[positions[i]], columns] -= 1
+        log_profile = np.log(get_laplace_profile(counts, t - 1))
+        log_probabilities = _window_log_probabilities(rows, log_profile)
+        probabilities = np.exp(log_probabilities - log_probabilities.max())
+        positions[i] = rng.choice(len(probabilities), p=probabilities / probabilities.sum())
+        counts[rows[positions[i]], columns] += 1
+
+        score = int(counts.max(axis=0).sum())
+        if score > best_score:
+            best_score = score
+            best_positions = positions.copy()
+            stale = 0
+        else:
+            stale += 1
+            if stale >= patience:
+                break
+
+    STATS.add("gibbs.iterations", iterations)
+    return best_score, best_positions
+
+
+def _init_pool_sequences(sequences: List[np.ndarray]):
+    global _POOL_SEQUENCES
+    _POOL_SEQUENCES = sequences
+
+
+def _init_restart_worker(sequences: List[np.ndarray], stats_enabled: bool):
+    STATS.enabled = stats_enabled
+    _init_pool_sequences(sequences)
+
+
+def _counted_restart(restart, l: int, seed, *args):
+    # Runs in a pool worker and hands the worker's counters back with the result
+    STATS.reset()
+    return restart(l, seed, *args), STATS.as_dict() if STATS.enabled else None
+
+
+def _run_restarts(name: str, restart, sequences: List[np.ndarray], l: int, restarts: int, seed, workers: int,
+                  *args) -> Tuple[List[int], str, int]:
+    # Restarts are independent, each gets its own seed and they run on a process
+    # pool that receives the window rows once per worker instead of once per task.
+    rows = [_window_rows(codes, l) for codes in sequences]
+    seeds = np.random.SeedSequence(seed).spawn(restarts)
+    workers = min(workers or os.cpu_count() or 1, restarts)
+
+    STATS.add(f"{name}.restarts", restarts)
+    with STATS.phase(f"{name}.search"):
+        if workers == 1:
+            _init_pool_sequences(rows)
+            results = [restart(l, s, *args) for s in seeds]
+        else:
+            with multiprocessing.Pool(workers, initializer=_init_restart_worker,
+                                      initargs=(rows, STATS.enabled)) as pool:
+                counted = pool.starmap(_counted_restart, [(restart, l, s, *args) for s in seeds])
+            results = []
+            for result, worker_stats in counted:
+                if worker_stats is not None:
+                    STATS.merge(worker_stats)
+                results.append(result)
+    _init_pool_sequences(None)
+
+    # Highest score wins, the earliest restart on ties
+    best_score, best_positions = max(results, key=lambda result: result[0])
+    motifs = [decode_dna(codes[p:p + l]) for codes, p in zip(sequences, best_positions)]
+    return [int(p) + 1 for p in best_positions], get_consensus(motifs), score_motifs(motifs)
+
+
+def randomized_motif_search(dna: str, n: int, l: int, t: int, restarts: int = 20, seed=None,
+                            workers: int = None, max_iterations: int = 1000) -> Tuple[List[int], str, int]:
+    sequences = [encode_dna(nmer) for nmer in get_nmers(dna, n, t)]
+    return randomized_motif_search_sequences(sequences, l, restarts, seed, workers, max_iterations)
+
+
+def randomized_motif_search_sequences(sequences, l: int, restarts: int = 20, seed=None, workers: int = None,
+                                      max_iterations: int = 1000) -> Tuple[List[int], str, int]:
+    return _run_restarts("randomized", _randomized_restart, sequences, l, restarts, seed, workers, max_iterations)
+
+
+def gibbs_sampler_motif_search(dna: str, n: int, l: int, t: int, restarts: int = 20, seed=None,
+                               workers: int = None, max_iterations: int = None,
+                               patience: int = None) -> Tuple[List[int], str, int]:
+    sequences = [encode_dna(nmer) for nmer in get_nmers(dna, n, t)]
+    return gibbs_sampler_motif_search_sequences(sequences, l, restarts, seed, workers, max_iterations, patience)
+
+
+def gibbs_sampler_motif_search_sequences(sequences, l: int, restarts: int = 20, seed=None, workers: int = None,
+                                         max_iterations: int = None,
+                                         patience: int = None) -> Tuple[List[int], str, int]:
+    t = len(sequences)
+    patience = patience or 10 * t
+    max_iterations = max_iterations or 100 * t
+    return _run_restarts("gibbs", _gibbs_restart, sequences, l, restarts, seed, workers, max_iterations, patience)
+
+
 def hamming_distance(s1: str, s2: str) -> int:
     return sum(c1 != c2 for c1, c2 in zip(s1, s2))
 
@@ -159,147 +418,543 @@ def min_hamming_distance(pattern: str, text: str, l: int) -> Tuple[int, int]:
     return min_dist, min_pos + 1  # 1-indexed
 
 
+# 2-bit packed representation: A=00, C=01, G=10, T=11. pack_dna stores a sequence
+# 32 bases per 64-bit word and pack_windows cuts l-mers out of those words; an
+# l-mer with l <= 16 fits into one 32-bit word. The first base is always in the
+# most significant bits.
+NUCLEOTIDE_CODES = {'A': 0, 'C': 1, 'G': 2, 'T': 3}
+_CODE_TABLE = np.full(256, 255, dtype=np.uint8)
+for _nucleotide, _code in NUCLEOTIDE_CODES.items():
+    _CODE_TABLE[ord(_nucleotide)] = _code
+    _CODE_TABLE[ord(_nucleotide.lower())] = _code
+_LOW_BITS = 0x55555555
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def encode_dna(dna) -> np.ndarray:
+    if isinstance(dna, str):
+        dna = dna.encode('ascii')
+    codes = _CODE_TABLE[np.frombuffer(dna, dtype=np.uint8)]
+    if np.any(codes == 255):
+        raise ValueError("DNA may only contain the nucleotides A, C, G and T")
+    return codes
+
+
+def decode_dna(codes: np.ndarray) -> str:
+    return np.frombuffer(b"ACGT", dtype=np.uint8)[codes].tobytes().decode('ascii')
+
+
+def pack_lmer(lmer: str) -> int:
+    word = 0
+    for nucleotide in lmer:
+        word = (word << 2) | NUCLEOTIDE_CODES[nucleotide]
+    return word
+
+
+def unpack_lmer(word: int, l: int) -> str:
+    nucleotides = "ACGT"
+    return "".join(nucleotides[(word >> (2 * (l - 1 - i))) & 3] for i in range(l))
+
+
+def pack_dna(codes: np.ndarray) -> np.ndarray:
+    # 32 bases per uint64 word, followed by a zero word so that every window can
+    # read the word after the one it starts in
+    quads = np.zeros(32 * (len(codes) // 32 + 2), dtype=np.uint8)
+    quads[:len(codes)] = codes
+    quads = quads.reshape(-1, 4)
+    packed = (quads[:, 0] << 6) | (quads[:, 1] << 4) | (quads[:, 2] << 2) | quads[:, 3]
+    return packed.view('>u8').astype(np.uint64)
+
+
+def pack_windows(words: np.ndarray, count: int, l: int) -> np.ndarray:
+    # Packed l-mers starting at positions 0 .. count - 1 along the last axis of
+    # packed words, each one shifted out of the word it starts in and the next one
+    if l > 16:
+        raise ValueError("Packed l-mers are limited to l <= 16")
+    positions = np.arange(count)
+    index = positions // 32
+    shift = (2 * (positions % 32)).astype(np.uint64)
+    high = words[..., index] << shift
+    # Two shifts, so a window that starts on a word boundary takes nothing from the next word
+    low = (words[..., index + 1] >> np.uint64(1)) >> (np.uint64(63) - shift)
+    return ((high | low) >> np.uint64(64 - 2 * l)).astype(np.uint32)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    words = np.ascontiguousarray(words, dtype=np.uint32)
+    return _POPCOUNT_TABLE[words.view(np.uint8)].reshape(words.shape + (4,)).sum(axis=-1, dtype=np.uint8)
+
+
+def packed_hamming_distance(word1, word2, mask: int = _LOW_BITS):
+    # XOR leaves a non-zero bit pair for every mismatching base, fold each pair
+    # into its low bit and count them. mask keeps the low bits of the bases to
+    # compare, all of them by default. Works on ints and on NumPy arrays.
+    diff = word1 ^ word2
+    diff = (diff | (diff >> 1)) & mask
+    if isinstance(diff, np.ndarray):
+        return popcount(diff.astype(np.uint32, copy=False))
+    return int(diff).bit_count()
+
+
+def packed_min_hamming_distance(pattern: int, windows: np.ndarray, padding: np.ndarray = None,
+                                mask: int = _LOW_BITS) -> Tuple[np.ndarray, np.ndarray]:
+    # Minimum distance and its first 1-indexed position for every row of windows,
+    # ignoring the windows marked in padding
+    distances = packed_hamming_distance(windows, np.uint32(pattern), np.uint32(mask))
+    if padding is not None:
+        distances = np.where(padding, 255, distances)
+    positions = np.argmin(distances, axis=-1)
+    return np.take_along_axis(distances, positions[..., None], axis=-1)[..., 0], positions + 1
+
+
+def pad_sequences(sequences, l: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Encoded sequences as one (t, longest) array and the length of each of them
+    lengths = np.array([len(codes) for codes in sequences])
+    if lengths.min() < l:
+        raise ValueError(f"Every sequence must be at least l={l} bases long")
+    codes = np.zeros((len(sequences), lengths.max()), dtype=np.uint8)
+    for i, sequence in enumerate(sequences):
+        codes[i, :len(sequence)] = sequence
+    return codes, lengths
+
+
+def pack_sequence_windows(sequences, l: int) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    # Packed l-mers of every sequence, padded to the longest one, and a mask of
+    # the windows past the end of shorter sequences (None if there are none)
+    lengths = np.array([len(codes) for codes in sequences])
+    if lengths.min() < l:
+        raise ValueError(f"Every sequence must be at least l={l} bases long")
+    words = np.zeros((len(sequences), lengths.max() // 32 + 2), dtype=np.uint64)
+    for i, codes in enumerate(sequences):
+        packed = pack_dna(codes)
+        words[i, :len(packed)] = packed
+
+    count = lengths.max() - l + 1
+    padding = np.arange(count)[None, :] > (lengths - l)[:, None]
+    return pack_windows(words, count, l), padding if padding.any() else None
+
+
 def branch_and_bound_motif_search(dna: str, n: int, l: int, t: int) -> tuple[list[Any], str, float]:
-    nmers = get_nmers(dna, n, t)
-    nucleotides = ['A', 'C', 'G', 'T']
+    return branch_and_bound_motif_search_sequences([encode_dna(nmer) for nmer in get_nmers(dna, n, t)], l)
+
+
+def branch_and_bound_motif_search_sequences(sequences, l: int) -> tuple[list[Any], str, float]:
+    t = len(sequences)
+    with STATS.phase("bnb.encode"):
+        windows, padding = pack_sequence_windows(sequences, l)
 
     best_consensus = ""
     best_distance = float('inf')
     best_positions = []
 
-    def calculate_partial_distance(partial_pattern):
-        total_distance = 0
-        positions = []
-
-        for nmer in nmers:
-            min_dist, pos = min_hamming_distance(partial_pattern, nmer, len(partial_pattern))
-            total_distance += min_dist
-            positions.append(pos)
+    # A prefix of the given length is compared with the first bases of the l-mer
+    # windows only, so only starts with room for a whole l-mer count. That is
+    # still a lower bound on every extension, so the same first best l-mer is found.
+    prefix_masks = [_LOW_BITS & ~((1 << 2 * (l - length)) - 1) for length in range(l + 1)]
 
-            if total_distance >= best_distance:
-                break
-
-        return total_distance, positions
+    def calculate_partial_distance(pattern, length):
+        if length == 0:
+            return 0, [1] * t
+        distances, positions = packed_min_hamming_distance(
+            pattern << 2 * (l - length), windows, padding, prefix_masks[length])
+        return int(distances.sum()), positions.tolist()
 
-    def dfs(partial_consensus):
-        nonlocal best_consensus, best_distance, best_positions
+    nodes = prunes = improvements = 0
 
-        # print("Current partial consensus:", partial_consensus)
+    def dfs(pattern, length):
+        nonlocal best_consensus, best_distance, best_positions, nodes, prunes, improvements
 
-        current_distance, current_positions = calculate_partial_distance(partial_consensus)
+        nodes += 1
+        current_distance, current_positions = calculate_partial_distance(pattern, length)
 
         if current_distance >= best_distance:
+            prunes += 1
             return
 
-        if len(partial_consensus) == l:
+        if length == l:
+            improvements += 1
             best_distance = current_distance
-            best_consensus = partial_consensus
+            best_consensus = unpack_lmer(pattern, l)
             best_positions = current_positions
             return
 
-        for nucleotide in nucleotides:
-            dfs(partial_consensus + nucleotide)
+        # Nucleotides in the order A, C, G, T
+        for code in range(4):
+            dfs((pattern << 2) | code, length + 1)
 
-    dfs("")
+    with STATS.phase("bnb.search"):
+        dfs(0, 0)
+    STATS.add("bnb.nodes", nodes)
+    STATS.add("bnb.prunes", prunes)
+    STATS.add("bnb.improvements", improvements)
 
     return best_positions, best_consensus, best_distance
 
 
-import concurrent.futures
-
-def measure_performance(dna: str):
-    filename = "performance_results.txt"
-
-    for t in range(2, 6):
-        for l in range(2, 11):
-            for n in range(10, 101, 10):
-                print(f"\nTesting with l={l}, n={n}, t={t}")
-
-                # Measure greedy algorithm with timeout
-                greedy_time = None
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(recursive_greedy_motif_search, dna, n, l, t)
-                    try:
-                        start_time = time.time()
-                        future.result(timeout=10)  # 10 second timeout
-                        greedy_time = time.time() - start_time
-                        print(f"Greedy Motif Search Time: {greedy_time:.4f} seconds")
-                    except concurrent.futures.TimeoutError:
-                        print(f"Greedy algorithm aborted - exceeded 10 seconds")
-
-                # Measure branch and bound algorithm with timeout
-                bnb_time = None
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(branch_and_bound_motif_search, dna, n, l, t)
-                    try:
-                        start_time = time.time()
-                        future.result(timeout=10)  # 10 second timeout
-                        bnb_time = time.time() - start_time
-                        print(f"B&B Motif Search Time: {bnb_time:.4f} seconds")
-                    except concurrent.futures.TimeoutError:
-                        print(f"B&B algorithm aborted - exceeded 10 seconds")
-
-                # Write to text file
-                with open(filename, 'a') as file:
-                    # file.write(f"l={l}, n={n}, t={t}, Greedy Time: {greedy_time} seconds, "
-                    #            f"B&B Time: {bnb_time} seconds\n")
-                    file.write(f"l={l}, n={n}, t={t}, ")
-                    if greedy_time is not None:
-                        file.write(f"Greedy Time: {greedy_time:.4f} seconds, ")
-                    else:
-                        file.write("Greedy Time: DNF, ")
-                    if bnb_time is not None:
-                        file.write(f"B&B Time: {bnb_time:.4f} seconds\n")
-                    else:
-                        file.write("B&B Time: DNF\n")
+def median_string_motif_search(dna: str, n: int, l: int, t: int,
+                               max_chunk_bytes: int = 1 << 24) -> tuple[list[Any], str, int]:
+    return median_string_motif_search_sequences([encode_dna(nmer) for nmer in get_nmers(dna, n, t)], l,
+                                                max_chunk_bytes)
+
+
+def median_string_motif_search_sequences(sequences, l: int,
+                                         max_chunk_bytes: int = 1 << 24) -> tuple[list[Any], str, int]:
+    # Scores all 4^l patterns without pruning. The distances of a pattern to every
+    # l-mer window are the distances of its prefix plus one mismatch table per added
+    # nucleotide, so patterns sharing a prefix share its table. The first l - inner
+    # nucleotides are enumerated one at a time, the last inner ones are expanded
+    # for all 4^inner suffixes at once in a chunk of at most max_chunk_bytes.
+    with STATS.phase("median.encode"):
+        codes, lengths = pad_sequences(sequences, l)
+        t, W = codes.shape[0], codes.shape[1] - l + 1
+
+        nucleotides = np.arange(4, dtype=np.uint8)[:, None, None]
+        # mismatches[p][c, i, w] is 1 when base p of window w of sequence i differs from c
+        mismatches = [(codes[None, :, p:p + W] != nucleotides).astype(np.uint8) for p in range(l)]
+        padding = np.arange(W)[None, :] > (lengths - l)[:, None]
+        # Padded windows start above any real distance so they never win the minimum
+        start = np.where(padding, l + 1, 0).astype(np.uint8)
+
+    inner = 1
+    while inner < l and 4 ** (inner + 1) * t * W <= max_chunk_bytes:
+        inner += 1
+    outer = l - inner
+
+    best_distance = float('inf')
+    best_pattern = 0
+
+    chunks = 0
+
+    def expand(distances, prefix):
+        nonlocal best_distance, best_pattern, chunks
+        chunks += 1
+        table = distances[None]
+        for p in range(outer, l):
+            table = (table[:, None] + mismatches[p][None]).reshape(-1, t, W)
+        totals = table.min(axis=2).sum(axis=1, dtype=np.int64)
+        # Suffixes are in lexicographic order, argmin and the strict comparison
+        # keep the first best pattern like branch and bound does
+        i = int(np.argmin(totals))
+        if totals[i] < best_distance:
+            best_distance = int(totals[i])
+            best_pattern = (prefix << (2 * inner)) | i
+
+    def dfs(distances, prefix, length):
+        if length == outer:
+            expand(distances, prefix)
+            return
+        for code in range(4):
+            dfs(distances + mismatches[length][code], (prefix << 2) | code, length + 1)
+
+    with STATS.phase("median.search"):
+        dfs(start, 0, 0)
+    STATS.add("median.chunks", chunks)
+    STATS.add("median.patterns", chunks * 4 ** inner)
+
+    with STATS.phase("median.collect"):
+        windows, _ = pack_sequence_windows(sequences, l)
+        _, positions = packed_min_hamming_distance(best_pattern, windows, padding)
+    return positions.tolist(), unpack_lmer(best_pattern, l), best_distance
+
+
+ALGORITHMS = {
+    "greedy": recursive_greedy_motif_search,
+    "bnb": branch_and_bound_motif_search,
+    "median": median_string_motif_search,
+}
+
+# Axes along which an algorithm's running time only grows. The exhaustive greedy
+# search explores (n - l + 1) ** t combinations, so a larger l makes it faster.
+MONOTONE_AXES = {
+    "greedy": ("n", "t"),
+    "bnb": ("l", "n", "t"),
+    "median": ("l", "n", "t"),
+}
+
+
+def _cell_key(cell: dict) -> Tuple[str, int, int, int]:
+    return cell["algorithm"], cell["l"], cell["n"], cell["t"]
+
+
+def _is_dominated(cell: dict, timed_out: List[dict]) -> Optional[dict]:
+    # A cell is skipped when a timed-out cell of the same algorithm is no larger
+    # along every monotone axis and equal along the others.
+    axes = MONOTONE_AXES[cell["algorithm"]]
+    for other in timed_out:
+        if other["algorithm"] != cell["algorithm"]:
+            continue
+        if all(other[axis] <= cell[axis] if axis in axes else other[axis] == cell[axis]
+               for axis in ("l", "n", "t")):
+            return other
+    return None
+
+
+def _run_cell(conn, algorithm: str, dna: str, n: int, l: int, t: int):
+    try:
+        start_time = time.perf_counter()
+        positions, consensus, score = ALGORITHMS[algorithm](dna, n, l, t)
+        conn.send(("ok", time.perf_counter() - start_time, consensus, float(score)))
+    except Exception as e:
+        conn.send(("error", None, repr(e), None))
+    finally:
+        conn.close()
+
+
+def load_results(filename: str) -> dict:
+    results = {}
+    if not os.path.exists(filename):
+        return results
+    with open(filename, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Last line of an interrupted sweep may be truncated
+                continue
+            results[_cell_key(record)] = record
+    return results
+
+
+def measure_performance(dna: str, filename: str = "performance_results.jsonl", timeout: float = 10,
+                        workers: int = None, algorithms=("greedy", "bnb")) -> dict:
+    # Every (l, n, t, algorithm) cell runs in its own process, so a cell that
+    # exceeds the timeout is killed instead of finishing in the background.
+    # Finished cells are appended to a JSON lines file and skipped on resume.
+    workers = workers or os.cpu_count() or 1
+    results = load_results(filename)
+    timed_out = [r for r in results.values() if r["status"] == "timeout"]
+
+    cells = deque({"algorithm": algorithm, "l": l, "n": n, "t": t}
+                  for t in range(2, 6)
+                  for l in range(2, 11)
+                  for n in range(10, 101, 10)
+                  for algorithm in algorithms)
+    cells = deque(cell for cell in cells if _cell_key(cell) not in results)
+    print(f"{len(results)} cells already in {filename}, {len(cells)} to run on {workers} workers")
+
+    ctx = multiprocessing.get_context()
+    running = {}  # connection -> (cell, process, deadline)
+
+    with open(filename, 'a') as file:
+        def record(cell, status, elapsed=None, consensus=None, score=None, **extra):
+            result = dict(cell, status=status, time=elapsed, consensus=consensus, score=score, **extra)
+            results[_cell_key(cell)] = result
+            file.write(json.dumps(result) + "\n")
+            file.flush()
+
+            label = f"l={cell['l']}, n={cell['n']}, t={cell['t']}, {cell['algorithm']}"
+            if status == "ok":
+                print(f"{label}: {elapsed:.4f} seconds")
+            elif status == "timeout":
+                print(f"{label}: aborted - exceeded {timeout} seconds")
+            else:
+                print(f"{label}: {status} {extra or consensus or ''}")
+
+        def skip(cell, other):
+            record(cell, "skipped", dominated_by=[other["l"], other["n"], other["t"]])
+
+        while cells or running:
+            while cells and len(running) < workers:
+                cell = cells.popleft()
+                other = _is_dominated(cell, timed_out)
+                if other is not None:
+                    skip(cell, other)
+                    continue
+                parent_conn, child_conn = ctx.Pipe(duplex=False)
+                process = ctx.Process(target=_run_cell, daemon=True,
+                                      args=(child_conn, cell["algorithm"], dna, cell["n"], cell["l"], cell["t"]))
+                process.start()
+                child_conn.close()
+                running[parent_conn] = (cell, process, time.monotonic() + timeout)
+
+            if not running:
+                continue
+            next_deadline = min(deadline for _, _, deadline in running.values())
+            for conn in wait(list(running), timeout=max(0.0, next_deadline - time.monotonic())):
+                cell, process, _ = running.pop(conn)
+                try:
+                    status, elapsed, consensus, score = conn.recv()
+                except EOFError:
+                    status, elapsed, consensus, score = "error", None, f"exit code {process.exitcode}", None
+                conn.close()
+                process.join()
+                record(cell, status, elapsed, consensus, score)
+
+            now = time.monotonic()
+            for conn, (cell, process, deadline) in list(running.items()):
+                # Already killed as dominated by an earlier timeout in this pass
+                if conn not in running or deadline > now:
+                    continue
+                del running[conn]
+                process.kill()
+                process.join()
+                conn.close()
+                record(cell, "timeout")
+                timed_out.append(cell)
+
+                # Larger cells that are already running cannot finish in time either
+                for other_conn, (other_cell, other_process, _) in list(running.items()):
+                    if _is_dominated(other_cell, [cell]) is not None:
+                        del running[other_conn]
+                        other_process.kill()
+                        other_process.join()
+                        other_conn.close()
+                        skip(other_cell, cell)
+
+    return results
+
 
 def create_expected_solutions_table():
-    # Format: (l, n, t, greedy_solution, greedy_score, bnb_solution, bnb_distance)
+    # Format: (l, n, t, greedy_solution, greedy_score, greedy_time, bnb_solution, bnb_distance, bnb_time)
+    # Times are reference seconds on DNK1.txt, best of 5 serial runs
     return [
-        (3, 10, 2, "CAA", 5, "AGC", 1),
-        (5, 15, 2, "CAAAT", 10, "CAAAT", 0),
-        (7, 20, 2, "CAAATGA", 12, "CAAATGA", 2),
-        (3, 10, 3, "CAA", 8, "CAA", 1),
-        (5, 15, 3, "CAAAT", 13, "AAATG", 2),
-        (7, 15, 3, "CAAATGA", 16, "AGATGTC", 5),
-        (7, 20, 3, "CAAATGC", 18, "CAAATGC", 3),
-        (3, 10, 4, "CAA", 10, "CAA", 2),
-        (5, 15, 4, "CAAAT", 17, "AAATG", 3),
-        (7, 15, 4, "CAAATGC", 22, "CAAATGC", 6),
-        (7, 20, 4, "TTCCAAG", 23, "TTCCAAG", 5),
-        (3, 10, 5, "CAA", 12, "CAA", 3),
-        (5, 15, 5, "CAAAT", 20, "AAATG", 5),
+        (3, 10, 2, "CAA", 5, 0.0008, "AGC", 1, 0.0005),
+        (5, 15, 2, "CAAAT", 10, 0.0023, "CAAAT", 0, 0.0012),
+        (7, 20, 2, "CAAATGA", 12, 0.0083, "CAAATGA", 2, 0.0084),
+        (3, 10, 3, "CAA", 8, 0.0064, "CAA", 1, 0.0004),
+        (5, 15, 3, "CAAAT", 13, 0.0256, "AAATG", 2, 0.0014),
+        (7, 15, 3, "CAAATGA", 16, 0.0191, "AGATGTC", 5, 0.0196),
+        (7, 20, 3, "CAAATGC", 18, 0.0727, "CAAATGC", 3, 0.0077),
+        (3, 10, 4, "CAA", 10, 0.0569, "CAA", 2, 0.0007),
+        (5, 15, 4, "CAAAT", 17, 0.3237, "AAATG", 3, 0.0018),
+        (7, 15, 4, "CAAATGC", 22, 0.1929, "CAAATGC", 6, 0.0150),
+        (7, 20, 4, "TTCCAAG", 23, 1.0839, "TTCCAAG", 5, 0.0165),
+        (3, 10, 5, "CAA", 12, 0.4599, "CAA", 3, 0.0008),
+        (5, 15, 5, "CAAAT", 20, 3.9874, "AAATG", 5, 0.0033),
     ]
 
 
-def verify_solutions(dna):
-    table = create_expected_solutions_table()
-    print("\nVerifying solutions against reference table:")
-    print("=" * 70)
-    print(f"{'l':^3} {'n':^3} {'t':^3} {'Expected Greedy':^15} {'Found?':^7} {'Expected B&B':^15} {'Found?':^7}")
-    print("-" * 70)
+VERIFY_ALGORITHMS = {
+    "greedy": recursive_greedy_motif_search,
+    "bnb": branch_and_bound_motif_search,
+}
 
-    for l, n, t, greedy_expected, greedy_score, bnb_expected, bnb_distance in table:
-        # Run algorithms
-        greedy_solutions, greedy_consensus, greedy_score = recursive_greedy_motif_search(dna, n, l, t)
-        bnb_solutions, bnb_consensus, bnb_scores = branch_and_bound_motif_search(dna, n, l, t)
 
-        # Check if expected solutions are found
-        greedy_found = greedy_expected == greedy_consensus and greedy_score == greedy_score
-        bnb_found = bnb_expected == bnb_consensus and bnb_scores == bnb_scores
+def _source_hash() -> str:
+    # Cached results are only valid for the code that produced them
+    with open(__file__, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
 
-        greedy_status = "✓" if greedy_found else "✗"
-        bnb_status = "✓" if bnb_found else "✗"
 
-        print(f"{l:^3} {n:^3} {t:^3} {greedy_expected + '(' + str(greedy_score) + ')':^15} {greedy_status:^7} "
-              f"{bnb_expected + '(' + str(bnb_distance) + ')':^15} {bnb_status:^7}")
+def _load_json(filename: str) -> dict:
+    if not os.path.exists(filename):
+        return {}
+    with open(filename, 'r') as file:
+        return json.load(file)
+
+
+def _save_json(filename: str, data: dict):
+    with open(filename + ".tmp", 'w') as file:
+        json.dump(data, file, indent=1, sort_keys=True)
+    os.replace(filename + ".tmp", filename)
+
+
+def _verify_cell(algorithm: str, dna: str, n: int, l: int, t: int) -> dict:
+    start_time = time.perf_counter()
+    positions, consensus, score = VERIFY_ALGORITHMS[algorithm](dna, n, l, t)
+    return {"positions": positions, "consensus": consensus, "score": float(score),
+            "time": time.perf_counter() - start_time}
+
+
+def _time_cells(cells: List[tuple], dna: str, repeats: int) -> List[float]:
+    # Best of several serial runs per cell. The runs go round-robin over all
+    # cells, so a short burst of load on the machine cannot spoil every run
+    # of the same cell.
+    times = [float("inf")] * len(cells)
+    for _ in range(repeats):
+        for i, (algorithm, l, n, t) in enumerate(cells):
+            start_time = time.perf_counter()
+            VERIFY_ALGORITHMS[algorithm](dna, n, l, t)
+            times[i] = min(times[i], time.perf_counter() - start_time)
+    return times
+
+
+def verify_solutions(dna, cache_file: str = "verification_cache.json", slowdown: float = 1.5,
+                     min_time: float = 0.05, repeats: int = 5, workers: int = None,
+                     use_cache: bool = True) -> bool:
+    # Checks consensus and score of every row against the reference table and
+    # the running time against the reference time in the table. Results are
+    # computed in parallel and cached by (algorithm, sequence hash, l, n, t) for
+    # the current source. Rows with a reference time of at least min_time are
+    # then timed again one at a time, best of repeats runs; shorter rows are
+    # dominated by noise and are not compared.
+    table = create_expected_solutions_table()
+    reference_times = {}
+    for l, n, t, _, _, greedy_time, _, _, bnb_time in table:
+        reference_times[("greedy", l, n, t)] = greedy_time
+        reference_times[("bnb", l, n, t)] = bnb_time
+    dna_hash = hashlib.sha256(dna.encode()).hexdigest()[:16]
+    source_hash = _source_hash()
+
+    cache = _load_json(cache_file) if use_cache else {}
+    if cache.get("source") != source_hash:
+        cache = {"source": source_hash, "results": {}}
+
+    cells = [(algorithm, l, n, t) for l, n, t, *_ in table for algorithm in VERIFY_ALGORITHMS]
+    missing = [cell for cell in cells if f"{cell[0]}:{dna_hash}:{cell[1]}:{cell[2]}:{cell[3]}" not in cache["results"]]
+    tasks = [(algorithm, dna, n, l, t) for algorithm, l, n, t in missing]
+    workers = min(workers or os.cpu_count() or 1, max(len(tasks), 1))
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            computed = pool.starmap(_verify_cell, tasks)
+    else:
+        computed = [_verify_cell(*task) for task in tasks]
+    timed = [cell for cell in missing if reference_times[cell] >= min_time]
+    serial_times = dict(zip(timed, _time_cells(timed, dna, repeats)))
+    for (algorithm, l, n, t), result in zip(missing, computed):
+        result["timed"] = (algorithm, l, n, t) in serial_times
+        if result["timed"]:
+            result["time"] = serial_times[(algorithm, l, n, t)]
+        result["cached"] = False
+        cache["results"][f"{algorithm}:{dna_hash}:{l}:{n}:{t}"] = result
+    if use_cache:
+        _save_json(cache_file, {"source": source_hash, "results": {
+            key: dict(value, cached=True) for key, value in cache["results"].items()}})
 
-        if not greedy_found:
-            print(f"  Greedy found instead: {greedy_consensus}, score: {greedy_score}")
-        if not bnb_found:
-            print(f"  B&B found instead: {bnb_consensus}, distance: {bnb_scores}")
+    print("\nVerifying solutions against reference table:")
+    print("=" * 96)
+    print(f"{'l':^3} {'n':^3} {'t':^3} {'Expected Greedy':^15} {'Found?':^7} {'Time':^9} "
+          f"{'Expected B&B':^15} {'Found?':^7} {'Time':^9} {'Ref. time':^19}")
+    print("-" * 96)
+
+    all_ok = True
+    for l, n, t, greedy_expected, greedy_score, _, bnb_expected, bnb_distance, _ in table:
+        expected = {"greedy": (greedy_expected, greedy_score), "bnb": (bnb_expected, bnb_distance)}
+        columns, notes, reference = [], [], []
+
+        for algorithm, (expected_consensus, expected_score) in expected.items():
+            result = cache["results"][f"{algorithm}:{dna_hash}:{l}:{n}:{t}"]
+            found = result["consensus"] == expected_consensus and result["score"] == expected_score
+            if not found:
+                all_ok = False
+                notes.append(f"  {algorithm} found instead: {result['consensus']}, score: {result['score']:g}")
+
+            reference_time = reference_times[(algorithm, l, n, t)]
+            reference.append(f"{reference_time:.4f}")
+            if not result["cached"] and result["timed"] and result["time"] > slowdown * reference_time:
+                all_ok = False
+                notes.append(f"  {algorithm} slower than reference: {result['time']:.4f} s "
+                             f"> {slowdown} * {reference_time:.4f} s")
+
+            time_column = (f"{result['time']:.4f}" + ("*" if result["cached"] else "")
+                           + ("" if result["timed"] else "~"))
+            columns.append(f"{expected_consensus + '(' + str(expected_score) + ')':^15} "
+                           f"{'✓' if found else '✗':^7} {time_column:^9}")
+
+        print(f"{l:^3} {n:^3} {t:^3} {' '.join(columns)} {' / '.join(reference):^19}")
+        for note in notes:
+            print(note)
+
+    print("=" * 96)
+    print("* cached result, time of the original run")
+    print(f"~ reference time under {min_time * 1000:g} ms, single parallel run, not compared")
+    return all_ok
 
-    print("=" * 70)
 
 if __name__ == '__main__':
     filename = "DNK1.txt"
@@ -310,22 +965,112 @@ if __name__ == '__main__':
     # verify_solutions(read_dna_file(filename))
     # exit(0)
 
+    if "--stats" in sys.argv:
+        # Report search effort of whatever runs below, also on the early exits
+        sys.argv.remove("--stats")
+        STATS.enabled = True
+        atexit.register(lambda: print("\nSearch effort:\n" + STATS.report("phase")))
+
+    if len(sys.argv) > 1 and sys.argv[1] == "verify":
+        # python main.py verify [DNA file] [--no-cache]
+        verify_file = next((arg for arg in sys.argv[2:] if not arg.startswith("--")), filename)
+        ok = verify_solutions(read_dna_file(verify_file), use_cache="--no-cache" not in sys.argv)
+        exit(0 if ok else 1)
+
+    restarts = 20
     if len(sys.argv) > 1:
         filename = sys.argv[1]
         l = int(sys.argv[2])
-        n = int(sys.argv[3])
+        n = sys.argv[3]
         t = int(sys.argv[4])
+        mode = sys.argv[5] if len(sys.argv) > 5 else "exact"
+        if len(sys.argv) > 6:
+            restarts = int(sys.argv[6])
     else:
         filename = input("Enter DNA file path: ")
-        l = int(input("Enter l (size of l-mers, 2 <= l <= 10): "))
-        n = int(input("Enter n (size of n-mers, l <= n <= 100): "))
-        t = int(input("Enter t (number of n-mers, 2 <= t <= 5): "))
-
+        mode = input("Enter mode (exact, median, randomized, gibbs) [exact]: ") or "exact"
+        if mode == "exact":
+            l = int(input("Enter l (size of l-mers, 2 <= l <= 10): "))
+            n = input("Enter n (size of n-mers, l <= n <= 100): ")
+            t = int(input("Enter t (number of n-mers, 2 <= t <= 5): "))
+        else:
+            l = int(input("Enter l (size of l-mers, 2 <= l <= 16): "))
+            n = input("Enter n (size of n-mers, l <= n): ")
+            t = int(input("Enter t (number of n-mers, t >= 2): "))
+            restarts = int(input(f"Enter number of restarts [{restarts}]: ") or restarts)
+
+    if is_fasta_file(filename):
+        # n is 0 for whole records, one length for all records or a comma separated length per record
+        lengths = [int(x) for x in n.split(',')]
+        n = None if lengths == [0] else lengths[0] if len(lengths) == 1 else lengths
+        sequences = FastaSequences(filename, n=n, t=t)
+        if len(sequences) < t:
+            raise ValueError(f"{filename} only contains {len(sequences)} sequences")
+
+        if mode == "exact":
+            if not (2 <= l <= 10 and 2 <= t <= 5):
+                raise ValueError("Invalid parameters: 2 <= l <= 10, 2 <= t <= 5")
+            starts, consensus, score = branch_and_bound_motif_search_sequences(sequences, l)
+            method = "Branch & Bound"
+        elif mode == "median":
+            if not (2 <= l <= 10 and t >= 2):
+                raise ValueError("Invalid parameters: 2 <= l <= 10, t >= 2")
+            starts, consensus, score = median_string_motif_search_sequences(sequences, l)
+            method = "Median string"
+        elif mode in ("randomized", "gibbs"):
+            if not (2 <= l <= 16 and t >= 2):
+                raise ValueError("Invalid parameters: 2 <= l <= 16, t >= 2")
+            if mode == "randomized":
+                starts, consensus, score = randomized_motif_search_sequences(sequences, l, restarts=restarts)
+                method = "Randomized method"
+            else:
+                starts, consensus, score = gibbs_sampler_motif_search_sequences(sequences, l, restarts=restarts)
+                method = "Gibbs sampler"
+        else:
+            raise ValueError(f"Unknown mode: {mode}")
+
+        print("\nResults:")
+        print(f"{method} consensus: {consensus} ({'distance' if mode in ('exact', 'median') else 'score'}: {score})")
+        for name, start in zip(sequences.names, starts):
+            print(f"  {name}: {start}")
+        exit(0)
+
+    n = int(n)
     dna = read_dna_file(filename)
 
     # Validate parameters
-    if not (2 <= l <= 10 and l <= n <= 100 and 2 <= t <= 5):
-        ValueError("Invalid parameters: 2 <= l <= 10, l <= n <= 100, 2 <= t <= 5")
+    if mode == "exact":
+        if not (2 <= l <= 10 and l <= n <= 100 and 2 <= t <= 5):
+            raise ValueError("Invalid parameters: 2 <= l <= 10, l <= n <= 100, 2 <= t <= 5")
+    elif mode == "median":
+        # Running time is 4^l * t * n, independent of how well the data can be pruned
+        if not (2 <= l <= 10 and l <= n and t >= 2 and n * t <= len(dna)):
+            raise ValueError(f"Invalid parameters: 2 <= l <= 10, l <= n, t >= 2, n * t <= {len(dna)}")
+    elif mode in ("randomized", "gibbs"):
+        # Both samplers grow linearly with t * n, only the input length limits them
+        if not (2 <= l <= 16 and l <= n and t >= 2 and n * t <= len(dna)):
+            raise ValueError(f"Invalid parameters: 2 <= l <= 16, l <= n, t >= 2, n * t <= {len(dna)}")
+    else:
+        raise ValueError(f"Unknown mode: {mode}")
+
+    if mode == "median":
+        starts, consensus, distance = median_string_motif_search(dna, n, l, t)
+        print("\nResults:")
+        print(f"Median string consensus: {consensus} (distance: {distance})")
+        print(f"Median string positions: {starts}")
+        exit(0)
+    elif mode == "randomized":
+        starts, consensus, score = randomized_motif_search(dna, n, l, t, restarts=restarts)
+        print("\nResults:")
+        print(f"Randomized method consensus: {consensus} (score: {score})")
+        print(f"Randomized method positions: {starts}")
+        exit(0)
+    elif mode == "gibbs":
+        starts, consensus, score = gibbs_sampler_motif_search(dna, n, l, t, restarts=restarts)
+        print("\nResults:")
+        print(f"Gibbs sampler consensus: {consensus} (score: {score})")
+        print(f"Gibbs sampler positions: {starts}")
+        exit(0)
 
     # Run search and performance measurement
     # greedy_starts, greedy_consensus, greedy_score = greedy_motif_search(dna, n, l, t)
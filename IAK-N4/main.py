@@ -1,7 +1,24 @@
 import argparse
-import matplotlib.pyplot as plt
-import networkx as nx
+import hashlib
+import json
+import mmap
+import multiprocessing
+import os
+import random
+import struct
+import sys
+import tempfile
+from array import array
+import numpy as np
 import time
+from collections import deque
+
+
+# Skupni razred Stats iz stats.py v korenu repozitorija
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stats import Stats
+
+STATS = Stats()
 
 
 class KeywordTreeNode:
@@ -9,168 +26,1007 @@ class KeywordTreeNode:
         self.children = {}
         self.is_end = False
         self.word = None
+        self.fail = None            # najdaljša prava pripona, ki je tudi v drevesu
+        self.output = None          # najbližje končno vozlišče po verigi fail
 
 
 class KeywordTree:
     def __init__(self):
         self.root = KeywordTreeNode()
+        self._links_built = False
 
     def insert(self, word):
         node = self.root
+        created = 0
         for char in word:
             if char not in node.children:
                 node.children[char] = KeywordTreeNode()
+                created += 1
             node = node.children[char]
+        STATS.add("keyword_tree.nodes", created)
         node.is_end = True
         node.word = word
+        self._links_built = False
 
     def build_tree(self, keywords):
-        for word in keywords:
-            self.insert(word)
+        with STATS.phase("keyword_tree.build"):
+            for word in keywords:
+                self.insert(word)
+            self._build_failure_links()
+
+    def _build_failure_links(self):
+        # Aho-Corasick: povezave fail in output po plasteh (BFS) od korena navzdol
+        root = self.root
+        root.fail = root
+        queue = deque()
+        for child in root.children.values():
+            child.fail = root
+            child.output = None
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for char, child in node.children.items():
+                fail = node.fail
+                while fail is not root and char not in fail.children:
+                    fail = fail.fail
+                child.fail = fail.children.get(char, root)
+                if child.fail is child:
+                    child.fail = root
+                child.output = child.fail if child.fail.is_end else child.fail.output
+                queue.append(child)
+        self._links_built = True
+
+    def keywords(self):
+        # Ključne besede v premem vrstnem redu (preorder) drevesa
+        words = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.is_end:
+                words.append(node.word)
+            stack.extend(reversed(list(node.children.values())))
+        return words
+
+    def _order_results(self, grouped_results):
+        # Enak vrstni red ključev kot pri iskanju od vsakega začetka: po prvem
+        # zadetku, pri istem začetku v premem vrstnem redu drevesa
+        rank = {word: i for i, word in enumerate(self.keywords())}
+        return dict(sorted(grouped_results.items(), key=lambda item: (item[1][0], rank[item[0]])))
+
+    def search_all(self, text, max_k=0, edit_distance=False):
+        with STATS.phase("keyword_tree.search"):
+            if edit_distance:
+                return self._order_results(BitParallelMatcher(self.keywords()).search_edits(text, max_k))
+            if max_k == 0:
+                return self._search_exact(text)
+            return self._order_results(BitParallelMatcher(self.keywords()).search_mismatches(text, max_k))
+
+    def search_file(self, path, max_k=0, edit_distance=False, workers=None, chunk_size=1 << 22):
+        # Kot search_all(vsebina datoteke brez '\n'), le da se datoteka bere po kosih
+        # in se kosi preiščejo vzporedno. Sosednja kosa se prekrivata za najdaljšo
+        # besedo + k znakov, zato vsak zadetek v celoti leži v kosu, kjer se začne.
+        keywords = self.keywords()
+        overlap = max(map(len, keywords), default=0) + max_k
+        chunks = read_text_chunks(path, chunk_size, overlap)
+        workers = workers or os.cpu_count() or 1
+        grouped_results = {}
+
+        def merge(chunk_results, worker_stats=None):
+            if worker_stats is not None:
+                STATS.merge(worker_stats)
+            STATS.add("keyword_tree.chunks")
+            for word, positions in chunk_results.items():
+                grouped_results.setdefault(word, []).extend(positions)
+
+        if workers == 1:
+            for offset, core, chunk in chunks:
+                merge(_scan_chunk_results(self, offset, core, chunk, max_k, edit_distance))
+        else:
+            # Največ 2 * workers kosov naenkrat v obdelavi, da se datoteka ne prebere
+            # vnaprej v vrsto opravil
+            with multiprocessing.Pool(workers, initializer=_init_scan_worker,
+                                      initargs=(keywords, STATS.enabled)) as pool:
+                pending = deque()
+                for task in chunks:
+                    pending.append(pool.apply_async(_scan_chunk, (task, max_k, edit_distance)))
+                    if len(pending) >= 2 * workers:
+                        merge(*pending.popleft().get())
+                while pending:
+                    merge(*pending.popleft().get())
+
+        return self._order_results(grouped_results)
+
+    def _search_exact(self, text):
+        # En prehod čez besedilo, O(n + število zadetkov)
+        if not self._links_built:
+            self._build_failure_links()
+        root = self.root
+        grouped_results = {}
+        if root.is_end:
+            grouped_results[root.word] = list(range(len(text)))
+
+        node = root
+        for pos, char in enumerate(text):
+            while node is not root and char not in node.children:
+                node = node.fail
+            node = node.children.get(char, root)
+            match = node if node.is_end else node.output
+            while match is not None and match is not root:
+                grouped_results.setdefault(match.word, []).append(pos - len(match.word) + 1)
+                match = match.output
+
+        # Glavna zanka ne šteje ničesar, zadetke preštejemo iz rezultata
+        STATS.add("aho_corasick.chars", len(text))
+        if STATS.enabled:
+            STATS.add("aho_corasick.matches", sum(map(len, grouped_results.values())))
+        return self._order_results(grouped_results)
+
+
+def read_text_chunks(path, chunk_size, overlap):
+    # Vrača (odmik, jedro, kos): kos je besedilo datoteke brez '\n' od odmika naprej,
+    # dolgo jedro + overlap znakov. Kosu pripadajo le zadetki z začetkom v jedru.
+    buffer = ""
+    offset = 0
+    with open(path, "r") as f:
+        while True:
+            block = f.read(chunk_size)
+            buffer += block.replace("\n", "")
+            while len(buffer) >= chunk_size + overlap:
+                yield offset, chunk_size, buffer[:chunk_size + overlap]
+                buffer = buffer[chunk_size:]
+                offset += chunk_size
+            if not block:
+                break
+    if buffer or offset == 0:
+        yield offset, len(buffer), buffer
+
 
-    def search_all(self, text, max_k=0):
+def _scan_chunk_results(tree, offset, core, chunk, max_k, edit_distance):
+    # Zadetki v kosu, brez tistih v prekrivanju, z indeksi v celotnem besedilu
+    chunk_results = {}
+    for word, positions in tree.search_all(chunk, max_k=max_k, edit_distance=edit_distance).items():
+        positions = [offset + pos for pos in positions if pos < core]
+        if positions:
+            chunk_results[word] = positions
+    return chunk_results
+
+
+_SCAN_TREE = None
+
+
+def _init_scan_worker(keywords, stats_enabled):
+    global _SCAN_TREE
+    STATS.enabled = stats_enabled
+    _SCAN_TREE = KeywordTree()
+    _SCAN_TREE.build_tree(keywords)
+
+
+def _scan_chunk(task, max_k, edit_distance):
+    # Števci delavca se vrnejo skupaj z zadetki kosa, starš jih prišteje svojim
+    STATS.reset()
+    chunk_results = _scan_chunk_results(_SCAN_TREE, *task, max_k, edit_distance)
+    return chunk_results, STATS.as_dict() if STATS.enabled else None
+
+
+class BitParallelMatcher:
+    # Približno iskanje vseh ključnih besed hkrati z bitnimi vektorji, vsak znak
+    # besedila stane konstantno število operacij nad besedami.
+    # - Zamenjave (Hammingova razdalja, brez vstavljanj in brisanj): Shift-And po Wu-Manberju.
+    #   Vse besede so zložene v eno celo število, beseda dolžine m zasede m bitov.
+    # - Urejevalna razdalja: Myersov algoritem, besede so prav tako zložene v eno število.
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.starts = 0             # prvi bit vsakega bloka
+        self.finals = 0             # zadnji bit vsakega bloka
+        self.final_words = {}       # zadnji bit -> (beseda, dolžina)
+        self.masks = {}             # znak -> biti, kjer je ta znak v besedah
+        offset = 0
+        for word in self.keywords:
+            if not word:
+                continue
+            self.starts |= 1 << offset
+            self.finals |= 1 << (offset + len(word) - 1)
+            self.final_words[offset + len(word) - 1] = (word, len(word))
+            for j, char in enumerate(word):
+                self.masks[char] = self.masks.get(char, 0) | (1 << (offset + j))
+            offset += len(word)
+        self.width_mask = (1 << offset) - 1
+
+    def search_mismatches(self, text, max_k):
+        # R[j] ima bit i prižgan, če se prvih i + 1 znakov besede ujema z besedilom,
+        # ki se konča na trenutnem mestu, z največ j zamenjavami. Bit, ki ob pomiku
+        # uide v naslednji blok, prekrije prvi bit bloka, ki je vedno prižgan.
         grouped_results = {}
-        for i in range(len(text)):
-            self._search_from(text, i, self.root, i, max_k, grouped_results)
+        if "" in self.keywords:
+            grouped_results[""] = list(range(len(text)))
+        if not self.final_words:
+            return grouped_results
+
+        starts, finals, masks, width_mask = self.starts, self.finals, self.masks, self.width_mask
+        final_words = self.final_words
+        R = [0] * (max_k + 1)
+        for pos, char in enumerate(text):
+            B = masks.get(char, 0)
+            previous = ((R[0] << 1) | starts) & width_mask
+            R[0] = previous & B
+            for j in range(1, max_k + 1):
+                shifted = ((R[j] << 1) | starts) & width_mask
+                R[j] = (shifted & B) | previous
+                previous = shifted
+
+            hits = R[max_k] & finals
+            while hits:
+                low = hits & -hits
+                word, m = final_words[low.bit_length() - 1]
+                grouped_results.setdefault(word, []).append(pos - m + 1)
+                hits ^= low
+        STATS.add("bit_parallel.chars", len(text))
+        STATS.add("bit_parallel.state_words", len(text) * (max_k + 1))
         return grouped_results
 
-    def _search_from(self, text, text_pos, node, start_index, remaining_k, grouped_results):
-        if node.is_end:
-            grouped_results.setdefault(node.word, []).append(start_index)
+    def search_edits(self, text, max_k):
+        # Začetki i, pri katerih ima neka predpona text[i:] urejevalno razdaljo do
+        # besede največ max_k. Myers teče po obrnjenem besedilu z obrnjenimi besedami,
+        # tako da konci zadetkov postanejo začetki.
+        # Vse besede so zložene v eno celo število kot pri search_mismatches, le da ima
+        # blok besede dolžine m še c praznih bitov nad seboj: prenos pri seštevanju in
+        # bit, ki ob pomiku uide iz bloka, padeta vanje in ju maska P pobriše. V istih
+        # bitih od zadnjega bita besede navzgor ima vsaka beseda v številu S števec
+        # razdalje, zamaknjen tako, da je njegov najvišji bit ugasnjen natanko takrat,
+        # ko je razdalja največ max_k.
+        grouped_results = {}
+        if "" in self.keywords:
+            grouped_results[""] = list(range(len(text)))
+        words = [word for word in self.keywords if word]
+        if not words:
+            return grouped_results
 
-        if text_pos >= len(text):
-            return
+        c = max(max(map(len, words)), max_k + 1).bit_length()
+        bias = (1 << c) - max_k - 1
+        P = tops = highs = S = 0
+        high_words = {}             # najvišji bit števca -> beseda
+        peq = {}                    # znak -> biti, kjer je ta znak v obrnjenih besedah
+        offset = 0
+        for word in words:
+            m = len(word)
+            top = offset + m - 1
+            P |= ((1 << m) - 1) << offset
+            tops |= 1 << top
+            highs |= 1 << (top + c)
+            high_words[top + c] = word
+            S += (m + bias) << top
+            for j, char in enumerate(reversed(word)):
+                peq[char] = peq.get(char, 0) | (1 << (offset + j))
+            offset += m + c
+
+        Pv, Mv = P, 0
+        last = len(text) - 1
+        for r, char in enumerate(reversed(text)):
+            Eq = peq.get(char, 0)
+            Xv = Eq | Mv
+            Xh = ((((Eq & Pv) + Pv) & P) ^ Pv) | Eq
+            Ph = (Mv | ~(Xh | Pv)) & P
+            Mh = Pv & Xh
+            S += (Ph & tops) - (Mh & tops)
+            Ph = (Ph << 1) & P
+            Mh = (Mh << 1) & P
+            Pv = (Mh | ~(Xv | Ph)) & P
+            Mv = Ph & Xv
 
-        current_char = text[text_pos]
+            hits = ~S & highs
+            while hits:
+                low = hits & -hits
+                grouped_results.setdefault(high_words[low.bit_length() - 1], []).append(last - r)
+                hits ^= low
 
-        for char, child in node.children.items():
-            if char == current_char:
-                self._search_from(text, text_pos + 1, child, start_index, remaining_k, grouped_results)
-            elif remaining_k > 0:
-                self._search_from(text, text_pos + 1, child, start_index, remaining_k - 1, grouped_results)
+        for positions in grouped_results.values():
+            positions.reverse()
+        STATS.add("bit_parallel.chars", len(text))
+        STATS.add("bit_parallel.state_words", len(text) * 3)
+        return grouped_results
 
 
-class SuffixTreeNode:
-    def __init__(self):
-        self.children = {}          # label -> SuffixTreeNode
-        self.indexes = []           # začetni indeksi (listi)
+INDEX_MAGIC = b"IAKIDX\n\0"
+INDEX_VERSION = 1
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _aligned(size):
+    return (size + 7) // 8 * 8
+
+
+def encode_text(text):
+    # Abeceda besedila s simbolom '$' na mestu 0 in besedilo kot zaporedje kod
+    alphabet = "$" + "".join(sorted(set(text) - {"$"}))
+    symbols = {char: code for code, char in enumerate(alphabet)}
+    if len(alphabet) <= 256:
+        codes = text.translate({ord(char): code for char, code in symbols.items()}).encode("latin-1")
+    else:
+        codes = array("I", map(symbols.__getitem__, text))
+    return alphabet, symbols, codes
+
+
+class SuffixIndex:
+    # Skupni del sufiksnega drevesa in sufiksnega polja. Približno iskanje hodi po
+    # (navideznem) sufiksnem drevesu, ki ga podrazred opiše z root, _children in
+    # _leaf_range, in nikoli ne reže labelov iz besedila. Listi so v self.leaves v
+    # leksikografskem (DFS) vrstnem redu, zato so listi poddrevesa rezina [lo, hi).
+
+    _saved_arrays = ()
 
-class SuffixTree:
     def __init__(self, text):
         self.text = text + "$"
         # self.text = text
-        self.root = SuffixTreeNode()
-        self._build_suffix_tree()
-        self._compress_tree(self.root)
+        self.alphabet, self.symbols, self.codes = encode_text(self.text)
+        self.sigma = len(self.alphabet)
+        self.content_hash = content_hash(text)
+        self.path = None                # datoteka, v katero je bil indeks shranjen
+
+    def save(self, path):
+        # Binarna datoteka: MAGIC, dolžina glave, glava v JSON, nato surove tabele,
+        # poravnane na 8 bajtov, da jih load lahko preslika v pomnilnik brez kopiranja.
+        entries, blobs, offset = [], [], 0
+        for name in ("codes",) + self._saved_arrays:
+            values = getattr(self, name)
+            if isinstance(values, np.ndarray):
+                typecode, data, is_numpy = values.dtype.str, values.tobytes(), True
+            elif isinstance(values, (bytes, memoryview)):
+                typecode, data, is_numpy = "B", bytes(values), False
+            else:
+                typecode, data, is_numpy = values.typecode, values.tobytes(), False
+            entries.append({"name": name, "typecode": typecode, "length": len(values),
+                            "offset": offset, "size": len(data), "numpy": is_numpy})
+            blobs.append(data)
+            offset += _aligned(len(data))
+
+        header = json.dumps({"version": INDEX_VERSION, "kind": type(self).__name__,
+                             "content_hash": self.content_hash, "alphabet": self.alphabet,
+                             "byteorder": sys.byteorder, "arrays": entries}).encode("utf-8")
+        data_start = _aligned(len(INDEX_MAGIC) + 4 + len(header))
+
+        try:
+            with open(path + ".tmp", "wb") as f:
+                f.write(INDEX_MAGIC + struct.pack("<I", len(header)) + header)
+                f.write(b"\0" * (data_start - len(INDEX_MAGIC) - 4 - len(header)))
+                for data in blobs:
+                    f.write(data)
+                    f.write(b"\0" * (_aligned(len(data)) - len(data)))
+            os.replace(path + ".tmp", path)
+        except OSError:
+            # Napol zapisane začasne datoteke ne pustimo za sabo
+            if os.path.exists(path + ".tmp"):
+                os.remove(path + ".tmp")
+            raise
+        self.path = path
+
+    @classmethod
+    def load(cls, path, expected_hash=None):
+        with STATS.phase("suffix_index.load"):
+            return cls._load(path, expected_hash)
+
+    @classmethod
+    def _load(cls, path, expected_hash):
+        # Tabele ostanejo v preslikani datoteki, kopira se le besedilo
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise ValueError(f"{path} ni datoteka z indeksom")
+        header_size, = struct.unpack_from("<I", mapped, len(INDEX_MAGIC))
+        header = json.loads(mapped[len(INDEX_MAGIC) + 4:len(INDEX_MAGIC) + 4 + header_size])
+        if header["version"] != INDEX_VERSION or header["kind"] != cls.__name__ \
+                or header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} vsebuje indeks druge vrste ali različice")
+        if expected_hash is not None and header["content_hash"] != expected_hash:
+            raise ValueError(f"{path} je bil zgrajen za drugo besedilo")
+
+        index = cls.__new__(cls)
+        index.alphabet = header["alphabet"]
+        index.symbols = {char: code for code, char in enumerate(index.alphabet)}
+        index.sigma = len(index.alphabet)
+        index.content_hash = header["content_hash"]
+        index.path = path
+        index._mapped = mapped
+
+        data_start = _aligned(len(INDEX_MAGIC) + 4 + header_size)
+        for entry in header["arrays"]:
+            start = data_start + entry["offset"]
+            if start + entry["size"] > len(mapped):
+                raise ValueError(f"{path} je okrnjen")
+            if entry["numpy"]:
+                values = np.frombuffer(mapped, dtype=entry["typecode"], count=entry["length"], offset=start)
+            else:
+                values = memoryview(mapped)[start:start + entry["size"]].cast(entry["typecode"])
+            setattr(index, entry["name"], values)
+
+        index.codes = bytes(index.codes) if index.codes.format == "B" else array(index.codes.format, index.codes)
+        if all(ord(char) < 256 for char in index.alphabet):
+            table = bytes(map(ord, index.alphabet)).ljust(256, b"\0")
+            index.text = index.codes.translate(table).decode("latin-1")
+        else:
+            index.text = "".join(index.alphabet[code] for code in index.codes)
+        index._after_load()
+        return index
+
+    def _after_load(self):
+        pass
+
+    def encode_pattern(self, pattern):
+        # Znaki, ki jih ni v besedilu, dobijo kodo -1 in se nikoli ne ujemajo
+        return [self.symbols.get(char, -1) for char in pattern]
+
+    def _children(self, node):
+        # (otrok, začetek labela, konec labela) za vse otroke vozlišča
+        raise NotImplementedError
+
+    def _leaf_range(self, node):
+        # [lo, hi) listov poddrevesa v self.leaves
+        raise NotImplementedError
 
-    def _build_suffix_tree(self):
-        for i in range(len(self.text)):
-            node = self.root
-            for char in self.text[i:]:
-                if char not in node.children:
-                    node.children[char] = SuffixTreeNode()
-                node = node.children[char]
-            node.indexes.append(i)
-
-    def _compress_tree(self, node):
-        for char in list(node.children.keys()):
-            child = node.children[char]
-            label = char
-            while len(child.children) == 1 and not child.indexes:
-                next_char, next_child = next(iter(child.children.items()))
-                label += next_char
-                child = next_child
-            if label != char:
-                del node.children[char]
-                node.children[label] = child
-            self._compress_tree(child)
-
-
-    # Collect all matches
     def _collect_indexes(self, node):
-        result = list(node.indexes)
-        for child in node.children.values():
-            result.extend(self._collect_indexes(child))
-        return result
-
-    def search_approx(self, pattern, max_errors):
-        results = set()
-        for label, child in self.root.children.items():
-            self._search_approx_recursive(child, label, pattern, 0, max_errors, results)
-        return sorted(results)
-
-    def _search_approx_recursive(self, node, label, pattern, pat_idx, remaining_k, results):
-        i = 0
-        while i < len(label) and pat_idx < len(pattern):
-            if label[i] == pattern[pat_idx]:
-                i += 1
-                pat_idx += 1
-            elif remaining_k > 0:
-                # 3 možnosti: zamenjava, preskok v labelu, preskok v vzorcu
-                # 1. zamenjava (label[i] ≠ pattern[pat_idx])
-                self._search_approx_recursive(node, label[i+1:], pattern, pat_idx+1, remaining_k - 1, results)
-                # 2. preskok v labelu (vstavitev znaka v pattern)
-                self._search_approx_recursive(node, label[i+1:], pattern, pat_idx, remaining_k - 1, results)
-                # 3. preskok v vzorcu (izbris znaka v pattern)
-                self._search_approx_recursive(node, label[i:], pattern, pat_idx+1, remaining_k - 1, results)
-                return  # enkrat poskusi vse poti in zaključi
+        lo, hi = self._leaf_range(node)
+        return self.leaves[lo:hi].tolist()
+
+    def _report(self, ranges, count_only):
+        # Intervali zadetkov so disjunktni, zato je število zadetkov vsota dolžin
+        STATS.add("suffix_index.ranges", len(ranges))
+        if count_only:
+            return sum(hi - lo for lo, hi in ranges)
+        with STATS.phase("suffix_index.collect"):
+            results = []
+            for lo, hi in ranges:
+                results.extend(self.leaves[lo:hi].tolist())
+            STATS.add("suffix_index.occurrences", len(results))
+            return sorted(results)
+
+    def search_approx(self, pattern, max_errors, count_only=False):
+        # Po drevesu nosimo en stolpec dinamičnega programa za urejevalno razdaljo:
+        # column[i] je razdalja med pattern[:i] in nizom od korena do trenutne globine.
+        # Ko je column[m] <= k, se vse pripone pod vozliščem ujemajo, ko je najmanjša
+        # vrednost v stolpcu > k, se veja ne more več ujemati.
+        with STATS.phase("suffix_index.search"):
+            return self._search_approx(pattern, max_errors, count_only)
+
+    def _search_approx(self, pattern, max_errors, count_only):
+        pattern = self.encode_pattern(pattern)
+        m = len(pattern)
+        if m <= max_errors:
+            return self._report([self._leaf_range(self.root)], count_only)
+
+        codes = self.codes
+        ranges = []
+        nodes = columns = pruned = 0
+        column = list(range(m + 1))
+        stack = [(child, start, end, column) for child, start, end in self._children(self.root)]
+        while stack:
+            node, start, end, column = stack.pop()
+            nodes += 1
+            for pos in range(start, end):
+                columns += 1
+                char = codes[pos]
+                diagonal = column[0]
+                left = diagonal + 1
+                new_column = [left]
+                for i in range(m):
+                    up = column[i + 1]
+                    # zamenjava/ujemanje, izbris znaka v vzorcu, vstavitev znaka
+                    value = diagonal if pattern[i] == char else diagonal + 1
+                    if up + 1 < value:
+                        value = up + 1
+                    if left + 1 < value:
+                        value = left + 1
+                    new_column.append(value)
+                    left = value
+                    diagonal = up
+                column = new_column
+
+                if column[m] <= max_errors:
+                    ranges.append(self._leaf_range(node))
+                    break
+                if min(column) > max_errors:
+                    pruned += 1
+                    break
+            else:
+                # naprej na otroke
+                stack.extend((child, child_start, child_end, column)
+                             for child, child_start, child_end in self._children(node))
+
+        STATS.add("suffix_index.nodes", nodes)
+        STATS.add("suffix_index.dp_columns", columns)
+        STATS.add("suffix_index.pruned", pruned)
+        return self._report(ranges, count_only)
+
+
+class SuffixTree(SuffixIndex):
+    # Drevo je shranjeno v vzporednih tabelah celih števil. Notranja vozlišča so
+    # števila 0 (koren), 1, 2, ..., list pripone s je ~s (negativen). Otroci vozlišča
+    # v so children[v * sigma + c] za simbol c (0 pomeni, da otroka ni), listi pa ne
+    # potrebujejo nobenih podatkov: njihov label je text[s + globina starša:].
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.root = 0
+        self.start = array("i")         # začetek labela notranjega vozlišča v besedilu
+        self.depth = array("i")         # dolžina niza od korena do vozlišča
+        self.suffix_link = array("i")
+        self.children = array("i")
+        self._empty_row = array("i", [0]) * self.sigma
+        with STATS.phase("suffix_tree.build"):
+            self._new_internal_node(0, 0)
+            self._build_suffix_tree()
+            self._assign_leaf_ranges()
+        del self._empty_row
+        STATS.add("suffix_tree.internal_nodes", len(self.start))
+        STATS.add("suffix_tree.leaves", len(self.leaves))
+
+    _saved_arrays = ("start", "depth", "suffix_link", "children", "leaves", "leaf_rank", "leaf_lo", "leaf_hi")
+
+    def _after_load(self):
+        self.root = 0
+
+    def _new_internal_node(self, start, depth):
+        self.start.append(start)
+        self.depth.append(depth)
+        self.suffix_link.append(0)
+        self.children.extend(self._empty_row)
+        return len(self.start) - 1
+
+    def node_depth(self, node):
+        return self.depth[node] if node >= 0 else len(self.codes) - ~node
+
+    def edge(self, node, parent_depth):
+        # (start, end) labela povezave v vozlišče, ki visi na staršu globine parent_depth
+        if node >= 0:
+            return self.start[node], self.start[node] + self.depth[node] - parent_depth
+        return ~node + parent_depth, len(self.codes)
+
+    def edge_label(self, node, parent_depth):
+        start, end = self.edge(node, parent_depth)
+        return self.text[start:end]
+
+    def iter_children(self, node):
+        row = node * self.sigma
+        for child in self.children[row:row + self.sigma]:
+            if child:
+                yield child
+
+    def _build_suffix_tree(self):
+        # Ukkonen: v fazi i podaljšamo vse pripone za znak text[i]. Listi nimajo
+        # konca, zato se podaljšajo sami, notranja vozlišča imajo pripone povezave.
+        codes = self.codes
+        n = len(codes)
+        sigma = self.sigma
+        start, depth, suffix_link, children = self.start, self.depth, self.suffix_link, self.children
+        active_node, active_edge, active_length = 0, 0, 0
+        remainder = 0
+
+        for i in range(n):
+            char = codes[i]
+            remainder += 1
+            last_new_node = 0
+
+            while remainder > 0:
+                if active_length == 0:
+                    active_edge = i
+                slot = active_node * sigma + codes[active_edge]
+                next_node = children[slot]
+
+                if next_node == 0:
+                    # Pravilo 2: nov list iz active_node
+                    children[slot] = ~(i - remainder + 1)
+                    if last_new_node:
+                        suffix_link[last_new_node] = active_node
+                        last_new_node = 0
+                else:
+                    if next_node > 0:
+                        edge_start = start[next_node]
+                        edge_length = depth[next_node] - depth[active_node]
+                    else:
+                        edge_start = ~next_node + depth[active_node]
+                        edge_length = i + 1 - edge_start
+                    if active_length >= edge_length:
+                        # Skip/count: spustimo se po celotni povezavi
+                        active_node = next_node
+                        active_edge += edge_length
+                        active_length -= edge_length
+                        continue
+
+                    if codes[edge_start + active_length] == char:
+                        # Pravilo 3: pripona je že v drevesu, faza se konča
+                        if last_new_node and active_node:
+                            suffix_link[last_new_node] = active_node
+                            last_new_node = 0
+                        active_length += 1
+                        break
+
+                    # Pravilo 2: razcep povezave in nov list
+                    split = self._new_internal_node(edge_start, depth[active_node] + active_length)
+                    children[slot] = split
+                    children[split * sigma + char] = ~(i - remainder + 1)
+                    if next_node > 0:
+                        start[next_node] = edge_start + active_length
+                    children[split * sigma + codes[edge_start + active_length]] = next_node
+                    if last_new_node:
+                        suffix_link[last_new_node] = split
+                    last_new_node = split
+
+                remainder -= 1
+                if active_node == 0 and active_length > 0:
+                    active_length -= 1
+                    active_edge = i - remainder + 1
+                elif active_node != 0:
+                    active_node = suffix_link[active_node]
+
+    def _children(self, node):
+        if node < 0:
+            return
+        node_depth = self.depth[node]
+        for child in self.iter_children(node):
+            start, end = self.edge(child, node_depth)
+            yield child, start, end
+
+    def _assign_leaf_ranges(self):
+        # Iterativni DFS po otrocih v vrstnem redu simbolov: listi dobijo zaporedne
+        # položaje (self.leaves je tako kar sufiksno polje), notranje vozlišče pa
+        # interval [leaf_lo, leaf_hi) položajev svojih listov.
+        n = len(self.codes)
+        self.leaves = array("i", [0]) * n
+        self.leaf_rank = array("i", [0]) * n
+        self.leaf_lo = array("i", [0]) * len(self.start)
+        self.leaf_hi = array("i", [0]) * len(self.start)
+        rank = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node < 0:
+                self.leaves[rank] = ~node
+                self.leaf_rank[~node] = rank
+                rank += 1
+            elif node >= len(self.start):
+                # Izhod iz notranjega vozlišča node - len(start)
+                self.leaf_hi[node - len(self.start)] = rank
+            else:
+                self.leaf_lo[node] = rank
+                stack.append(node + len(self.start))
+                stack.extend(reversed(list(self.iter_children(node))))
+
+    def _leaf_range(self, node):
+        if node < 0:
+            rank = self.leaf_rank[~node]
+            return rank, rank + 1
+        return self.leaf_lo[node], self.leaf_hi[node]
+
+
+class SuffixArray(SuffixIndex):
+    # Sufiksno polje in LCP polje v NumPy tabelah (int32). Vozlišča navideznega
+    # sufiksnega drevesa so LCP intervali (lo, hi, globina): pripone sa[lo:hi] imajo
+    # skupno predpono dolžine globina, ki je najmanjši lcp v intervalu.
+
+    def __init__(self, text):
+        super().__init__(text)
+        codes = np.frombuffer(self.codes, dtype=np.uint8) if isinstance(self.codes, bytes) \
+            else np.array(self.codes, dtype=np.int64)
+        with STATS.phase("suffix_array.build"):
+            self.sa = self._build_suffix_array(codes)
+            self.lcp = self._build_lcp(self.sa)
+        self._after_load()
+
+    _saved_arrays = ("sa", "lcp")
+
+    def _after_load(self):
+        self.leaves = self.sa
+        self.root = (0, len(self.sa), 0)
+
+    @staticmethod
+    def _build_suffix_array(codes):
+        # Podvajanje predpon: v koraku k uredimo pripone po (rang[i], rang[i + k]),
+        # dokler niso vsi rangi različni. '$' je edinstven, zato je to O(n log^2 n).
+        n = len(codes)
+        rank = codes.astype(np.int64) + 1
+        k = 1
+        while True:
+            second = np.zeros(n, dtype=np.int64)
+            second[:n - k] = rank[k:]
+            sa = np.lexsort((second, rank))
+            first_sorted, second_sorted = rank[sa], second[sa]
+            changed = np.empty(n, dtype=np.int64)
+            changed[0] = 1
+            changed[1:] = (first_sorted[1:] != first_sorted[:-1]) | (second_sorted[1:] != second_sorted[:-1])
+            rank = np.empty(n, dtype=np.int64)
+            rank[sa] = np.cumsum(changed)
+            STATS.add("suffix_array.doubling_rounds")
+            if rank.max() == n or k >= n:
+                return sa.astype(np.int32)
+            k *= 2
+
+    def _build_lcp(self, sa):
+        # Kasai: lcp[i] je dolžina skupne predpone pripon sa[i - 1] in sa[i]
+        codes = self.codes
+        n = len(sa)
+        sa_list = sa.tolist()
+        rank = [0] * n
+        for i, suffix in enumerate(sa_list):
+            rank[suffix] = i
+        lcp = [0] * n
+        h = 0
+        for suffix in range(n):
+            if rank[suffix] > 0:
+                previous = sa_list[rank[suffix] - 1]
+                while suffix + h < n and previous + h < n and codes[suffix + h] == codes[previous + h]:
+                    h += 1
+                lcp[rank[suffix]] = h
+                if h > 0:
+                    h -= 1
+            else:
+                h = 0
+        return np.array(lcp, dtype=np.int32)
+
+    def _interval_depth(self, lo, hi):
+        if hi - lo == 1:
+            return len(self.codes) - int(self.sa[lo])
+        return int(self.lcp[lo + 1:hi].min())
+
+    def _children(self, node):
+        lo, hi, depth = node
+        if hi - lo == 1:
+            return
+        # Meje med otroki so mesta, kjer je lcp enak globini vozlišča
+        bounds = [lo] + (np.flatnonzero(self.lcp[lo + 1:hi] == depth) + lo + 1).tolist() + [hi]
+        for child_lo, child_hi in zip(bounds, bounds[1:]):
+            child_depth = self._interval_depth(child_lo, child_hi)
+            suffix = int(self.sa[child_lo])
+            yield (child_lo, child_hi, child_depth), suffix + depth, suffix + child_depth
+
+    def _leaf_range(self, node):
+        lo, hi, _ = node
+        return lo, hi
+
+    def _suffix_range(self, pattern):
+        # Interval pripon, ki se začnejo z vzorcem (dvojiško iskanje)
+        codes, sa = self.codes, self.sa
+        m = len(pattern)
+        pattern = bytes(pattern) if isinstance(codes, bytes) else array("I", pattern)
+
+        def prefix(i):
+            start = int(sa[i])
+            return codes[start:start + m]
+
+        lo, hi = 0, len(sa)
+        probes = 0
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probes += 1
+            if prefix(mid) < pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        first, hi = lo, len(sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probes += 1
+            if prefix(mid) == pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        STATS.add("suffix_array.probes", probes)
+        return first, lo
+
+    def search(self, pattern, count_only=False):
+        with STATS.phase("suffix_array.search"):
+            pattern = self.encode_pattern(pattern)
+            if -1 in pattern:
+                return 0 if count_only else []
+            return self._report([self._suffix_range(pattern)], count_only)
+
+    def search_approx(self, pattern, max_errors, count_only=False):
+        if max_errors == 0:
+            return self.search(pattern, count_only)
+        return super().search_approx(pattern, max_errors, count_only)
+
+
+def load_or_build_index(index_class, text, path):
+    # Vrne (indeks, naložen?). Indeks se ponovno zgradi, če datoteke ni, če je
+    # ni mogoče prebrati, če je druge različice ali poškodovana (TypeError vrže
+    # memoryview.cast pri velikosti, ki ni večkratnik elementa) ali če se je
+    # besedilo od gradnje spremenilo.
+    if os.path.exists(path):
+        try:
+            return index_class.load(path, content_hash(text)), True
+        except (OSError, ValueError, KeyError, TypeError, struct.error):
+            pass
+    index = index_class(text)
+    try:
+        index.save(path)
+    except OSError:
+        # Na primer mapa samo za branje: indeks ostane le v pomnilniku
+        pass
+    return index, False
+
+
+_BATCH_INDEX = None
+
+
+def _init_batch_worker(index_class_name, path, stats_enabled):
+    global _BATCH_INDEX
+    STATS.enabled = stats_enabled
+    if path is not None:
+        _BATCH_INDEX = globals()[index_class_name].load(path)
+
+
+def _batch_query(task):
+    pattern, max_errors, count_only = task
+    STATS.reset()
+    result = _BATCH_INDEX.search_approx(pattern, max_errors, count_only=count_only)
+    return pattern, result, STATS.as_dict() if STATS.enabled else None
+
+
+def search_batch(index, patterns, max_errors, workers=None, count_only=False, chunksize=16):
+    # Vrača (vzorec, rezultat) v vrstnem redu vzorcev, medtem ko jih procesi iščejo
+    # vzporedno. Indeks se ne pošilja delavcem: pri fork ga podedujejo (copy-on-write),
+    # sicer vsak delavec preslika isto datoteko indeksa v pomnilnik.
+    global _BATCH_INDEX
+    tasks = ((pattern, max_errors, count_only) for pattern in patterns)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for pattern, _, _ in tasks:
+            yield pattern, index.search_approx(pattern, max_errors, count_only=count_only)
+        return
+
+    temporary = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        _BATCH_INDEX = index
+        context, initargs = multiprocessing.get_context("fork"), (None, None, STATS.enabled)
+    else:
+        if index.path is None:
+            fd, temporary = tempfile.mkstemp(suffix=".idx")
+            os.close(fd)
+            index.save(temporary)
+        context, initargs = multiprocessing.get_context(), (type(index).__name__, index.path, STATS.enabled)
+
+    try:
+        with context.Pool(workers, initializer=_init_batch_worker, initargs=initargs) as pool:
+            for pattern, result, worker_stats in pool.imap(_batch_query, tasks, chunksize=chunksize):
+                if worker_stats is not None:
+                    STATS.merge(worker_stats)
+                yield pattern, result
+    finally:
+        _BATCH_INDEX = None
+        if temporary is not None:
+            index.path = None
+            os.remove(temporary)
+
+
+def read_patterns(path):
+    # En vzorec na vrstico, prazne vrstice se preskočijo
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def walk_tree(tree_root, suffix_index=None, max_depth=None, sample=None, label_limit=None, seed=0):
+    # Iterativni preorder sprehod po drevesu ključnih besed (suffix_index je None)
+    # ali po (navideznem) sufiksnem drevesu indeksa. Vrača
+    # (id, id starša, globina, label, info, izpuščeni otroci), kjer je info beseda
+    # oz. indeks pripone v listu. Pod max_depth se ne spušča, sample pa omeji
+    # število otrok vsakega vozlišča na naključni vzorec.
+    rng = random.Random(seed)
+
+    def _children(node):
+        if suffix_index is None:
+            return [(label, child, child.word if child.is_end else None)
+                    for label, child in node.children.items()]
+        children = []
+        for child, start, end in suffix_index._children(node):
+            if label_limit is not None and end - start > label_limit:
+                label = suffix_index.text[start:start + label_limit] + "..."
             else:
-                return
+                label = suffix_index.text[start:end]
+            lo, hi = suffix_index._leaf_range(child)
+            children.append((label, child, int(suffix_index.leaves[lo]) if hi - lo == 1 else None))
+        return children
 
-        if pat_idx == len(pattern):
-            results.update(self._collect_indexes(node))
+    next_id = 1
+    stack = [(tree_root, 0, None, 0, "ROOT", None)]
+    while stack:
+        node, node_id, parent_id, depth, label, info = stack.pop()
+        if max_depth is not None and depth >= max_depth:
+            # Otrok ne beremo, le preštejemo jih (brez labelov)
+            children = []
+            omitted = len(node.children) if suffix_index is None else \
+                sum(1 for _ in suffix_index._children(node))
         else:
-            # naprej na otroke
-            for next_label, child in node.children.items():
-                self._search_approx_recursive(child, next_label, pattern, pat_idx, remaining_k, results)
+            children = _children(node)
+            omitted = 0
+            if sample is not None and len(children) > sample:
+                omitted = len(children) - sample
+                children = [children[i] for i in sorted(rng.sample(range(len(children)), sample))]
+        yield node_id, parent_id, depth, label, info, omitted
 
+        pushed = []
+        for child_label, child, child_info in children:
+            pushed.append((child, next_id, node_id, depth + 1, child_label, child_info))
+            next_id += 1
+        stack.extend(reversed(pushed))
 
-def build_graph_from_tree(tree_root):
-    graph = nx.DiGraph()
-    node_id_counter = [0]  # mutable counter
-    node_to_id = {}
 
-    def _add_edges(node, parent_id):
-        for label, child in node.children.items():
-            node_id_counter[0] += 1
-            node_id = node_id_counter[0]
+def _dot_quote(text):
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
 
-            edge_label = label
-            # Optionally show index info for suffix trees
-            if hasattr(child, "indexes") and child.indexes:
-                edge_label += f" ({','.join(map(str, child.indexes))})"
 
-            graph.add_node(node_id, label=edge_label)
-            graph.add_edge(parent_id, node_id)
+def export_tree(out, tree_root, suffix_index=None, fmt="dot", max_depth=None, sample=None,
+                label_limit=32, seed=0):
+    # Drevo zapiše sproti v odprto datoteko out, brez gradnje grafa v pomnilniku.
+    # DOT za Graphviz ali JSON {"nodes": [...]} z enim zapisom na vozlišče.
+    nodes = walk_tree(tree_root, suffix_index, max_depth=max_depth, sample=sample,
+                      label_limit=label_limit, seed=seed)
+    if fmt == "dot":
+        out.write("digraph tree {\n    node [shape=box];\n")
+        for node_id, parent_id, depth, label, info, omitted in nodes:
+            text = label if info is None else f"{label} ({info})"
+            style = ", style=dashed" if omitted else ""
+            if omitted:
+                text += f" [+{omitted}]"
+            out.write(f"    n{node_id} [label={_dot_quote(text)}{style}];\n")
+            if parent_id is not None:
+                out.write(f"    n{parent_id} -> n{node_id};\n")
+        out.write("}\n")
+    elif fmt == "json":
+        out.write('{"nodes": [')
+        separator = "\n"
+        for node_id, parent_id, depth, label, info, omitted in nodes:
+            record = {"id": node_id, "parent": parent_id, "depth": depth, "label": label}
+            if info is not None:
+                record["info"] = info
+            if omitted:
+                record["omitted"] = omitted
+            out.write(separator + json.dumps(record, ensure_ascii=False))
+            separator = ",\n"
+        out.write("\n]}\n")
+    else:
+        raise ValueError(f"neznan format izvoza: {fmt}")
 
-            node_to_id[child] = node_id
-            _add_edges(child, node_id)
 
-    graph.add_node(0, label="ROOT")
-    node_to_id[tree_root] = 0
-    _add_edges(tree_root, 0)
+def build_graph_from_tree(tree_root, suffix_tree=None, max_depth=None, sample=None):
+    import networkx as nx
+
+    graph = nx.DiGraph()
+    for node_id, parent_id, depth, label, info, omitted in walk_tree(tree_root, suffix_tree, max_depth, sample):
+        # Pri sufiksnih drevesih pokaži še indeks lista
+        if suffix_tree is not None and info is not None:
+            label += f" ({info})"
+        graph.add_node(node_id, label=label)
+        if parent_id is not None:
+            graph.add_edge(parent_id, node_id)
 
     return graph
 
 
-def hierarchy_pos(G, root, width=1., vert_gap=0.2, vert_loc=0, xcenter=0.5, pos=None, parent=None):
-    # Vir: networkx
-    if pos is None:
-        pos = {root: (xcenter, vert_loc)}
-    else:
-        pos[root] = (xcenter, vert_loc)
-    children = list(G.successors(root))
-    if len(children) != 0:
-        dx = width / len(children)
-        nextx = xcenter - width / 2 - dx / 2
-        for child in children:
-            nextx += dx
-            pos = hierarchy_pos(G, child, width=dx, vert_gap=vert_gap,
-                                vert_loc=vert_loc - vert_gap, xcenter=nextx, pos=pos, parent=root)
+def hierarchy_pos(G, root, width=1., vert_gap=0.2, vert_loc=0, xcenter=0.5):
+    # Vir: networkx (iterativno namesto rekurzivno)
+    pos = {}
+    stack = [(root, width, vert_loc, xcenter)]
+    while stack:
+        node, width, vert_loc, xcenter = stack.pop()
+        pos[node] = (xcenter, vert_loc)
+        children = list(G.successors(node))
+        if len(children) != 0:
+            dx = width / len(children)
+            nextx = xcenter - width / 2 - dx / 2
+            for child in children:
+                nextx += dx
+                stack.append((child, dx, vert_loc - vert_gap, nextx))
     return pos
 
 
 def draw_tree_graph_manual_layout(graph, root_id=0):
+    import matplotlib.pyplot as plt
+    import networkx as nx
+
     pos = hierarchy_pos(graph, root=root_id)
     labels = nx.get_node_attributes(graph, 'label')
     plt.figure(figsize=(12, 6))
@@ -184,50 +1040,129 @@ def draw_tree_graph_manual_layout(graph, root_id=0):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Primerjava nizov z uporabo eksaktnega in približnega iskanja.")
     parser.add_argument("--file", type=str, required=True, help="Pot do datoteke z DNK zapisi")
-    parser.add_argument("--keywords", type=str, required=True, help="Vnos ključnih besed, ločenih z vejico")
+    parser.add_argument("--keywords", type=str, help="Vnos ključnih besed, ločenih z vejico")
+    parser.add_argument("--queries", type=str,
+                        help="Datoteka z vzorci (eden na vrstico) za paketno iskanje v indeksu s priponami")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Število procesov za paketno iskanje in iskanje po kosih (privzeto število jeder)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="KeywordTree: beri datoteko po kosih te velikosti in jih preišči vzporedno")
+    parser.add_argument("--no-index", action="store_true",
+                        help="Izpusti iskanje z indeksom s priponami (ta potrebuje celotno besedilo v pomnilniku)")
     parser.add_argument("--k", type=int, required=True, help="Parameter k (največje dovoljeno število napak)")
+    parser.add_argument("--edit", action="store_true",
+                        help="KeywordTree: urejevalna razdalja namesto samih zamenjav")
+    parser.add_argument("--count", action="store_true",
+                        help="Izpiši le število zadetkov namesto indeksov")
+    parser.add_argument("--no-persist", action="store_true",
+                        help="Ne shranjuj in ne nalagaj indeksa iz datoteke <file>.<index>.idx")
+    parser.add_argument("--index", choices=["tree", "sa"], default="tree",
+                        help="Indeks za iskanje s priponami: sufiksno drevo (tree) ali sufiksno polje (sa)")
+    parser.add_argument("--draw", action="store_true",
+                        help="Nariši drevo ključnih besed in sufiksno drevo (matplotlib, networkx)")
+    parser.add_argument("--export", type=str, default=None,
+                        help="Izvozi sufiksno drevo v datoteko .dot ali .json")
+    parser.add_argument("--export-keywords", type=str, default=None,
+                        help="Izvozi drevo ključnih besed v datoteko .dot ali .json")
+    parser.add_argument("--export-depth", type=int, default=None,
+                        help="Izvozi ali nariši le vozlišča do te globine")
+    parser.add_argument("--export-sample", type=int, default=None,
+                        help="Izvozi ali nariši največ toliko naključno izbranih otrok vsakega vozlišča")
+    parser.add_argument("--stats", action="store_true",
+                        help="Štej opravljeno delo (vozlišča, stolpce DP, prehode fail ...) in meri čase faz")
 
     args = parser.parse_args()
-    with open(args.file, 'r') as f:
-        content = f.read().replace("\n", "")
+    if args.keywords is None and args.queries is None:
+        parser.error("podaj --keywords ali --queries")
+    STATS.enabled = args.stats
 
-    keywords = args.keywords.split(',')
+    keywords = args.keywords.split(',') if args.keywords else []
     k = args.k
 
-    keywordtree = KeywordTree()
-    start_time = time.time()
-    keywordtree.build_tree(keywords)
-    build_time = time.time() - start_time
-    print(f"[KeywordTree] Čas za gradnjo drevesa: {build_time*1000:.4f} ms")
-    # keyword_graph = build_graph_from_tree(keywordtree.root)
-    # draw_tree_graph_manual_layout(keyword_graph)
-    start_time = time.time()
-    matches = keywordtree.search_all(content, max_k=k)
-    search_time = time.time() - start_time
-    print("[KeywordTree] Najdeni nizi:")
-    for word, positions in matches.items():
-        print(f"'{word}' najden na indeksih: {positions}")
-        # print(f"'{word}' najden {len(positions)} krat")
-    print(f"[KeywordTree] Čas iskanja: {search_time*1000:.4f} ms")
-    print(f"[KeywordTree] Skupni čas: {(build_time + search_time)*1000:.4f} ms\n")
+    if keywords:
+        keywordtree = KeywordTree()
+        start_time = time.time()
+        keywordtree.build_tree(keywords)
+        build_time = time.time() - start_time
+        print(f"[KeywordTree] Čas za gradnjo drevesa: {build_time*1000:.4f} ms")
+        if args.export_keywords:
+            with open(args.export_keywords, "w") as out:
+                export_tree(out, keywordtree.root, fmt="json" if args.export_keywords.endswith(".json") else "dot",
+                            max_depth=args.export_depth, sample=args.export_sample)
+        if args.draw:
+            keyword_graph = build_graph_from_tree(keywordtree.root, max_depth=args.export_depth,
+                                                  sample=args.export_sample)
+            draw_tree_graph_manual_layout(keyword_graph)
+        start_time = time.time()
+        if args.chunk_size:
+            matches = keywordtree.search_file(args.file, max_k=k, edit_distance=args.edit,
+                                              workers=args.workers, chunk_size=args.chunk_size)
+        else:
+            with open(args.file, 'r') as f:
+                matches = keywordtree.search_all(f.read().replace("\n", ""), max_k=k, edit_distance=args.edit)
+        search_time = time.time() - start_time
+        print("[KeywordTree] Najdeni nizi:")
+        for word, positions in matches.items():
+            if args.count:
+                print(f"'{word}' najden {len(positions)} krat")
+            else:
+                print(f"'{word}' najden na indeksih: {positions}")
+        print(f"[KeywordTree] Čas iskanja: {search_time*1000:.4f} ms")
+        print(f"[KeywordTree] Skupni čas: {(build_time + search_time)*1000:.4f} ms\n")
+        if args.stats:
+            print("[KeywordTree] Opravljeno delo:")
+            print(STATS.report() + "\n")
+            STATS.reset()
 
-    print("--------------------------------------------------\n")
+        print("--------------------------------------------------\n")
 
+    if args.no_index:
+        sys.exit(0)
+    with open(args.file, 'r') as f:
+        content = f.read().replace("\n", "")
+
+    index_name = "SuffixTree" if args.index == "tree" else "SuffixArray"
     start_time = time.time()
-    suffixtree = SuffixTree(content)
+    index_class = SuffixTree if args.index == "tree" else SuffixArray
+    if args.no_persist:
+        suffixtree, loaded = index_class(content), False
+    else:
+        suffixtree, loaded = load_or_build_index(index_class, content, f"{args.file}.{args.index}.idx")
     build_time = time.time() - start_time
-    print(f"[SuffixTree] Čas za gradnjo sufiksnega drevesa: {build_time*1000:.4f} ms")
-    # suffix_graph = build_graph_from_tree(suffixtree.root)
-    # draw_tree_graph_manual_layout(suffix_graph)
+    if loaded:
+        print(f"[{index_name}] Čas za nalaganje indeksa iz {args.file}.{args.index}.idx: {build_time*1000:.4f} ms")
+    elif args.index == "tree":
+        print(f"[{index_name}] Čas za gradnjo sufiksnega drevesa: {build_time*1000:.4f} ms")
+    else:
+        print(f"[{index_name}] Čas za gradnjo sufiksnega polja: {build_time*1000:.4f} ms")
+    if args.export:
+        with open(args.export, "w") as out:
+            export_tree(out, suffixtree.root, suffixtree, fmt="json" if args.export.endswith(".json") else "dot",
+                        max_depth=args.export_depth, sample=args.export_sample)
+    if args.draw:
+        suffix_graph = build_graph_from_tree(suffixtree.root, suffixtree, max_depth=args.export_depth,
+                                             sample=args.export_sample)
+        draw_tree_graph_manual_layout(suffix_graph)
     search_time = 0
-    print("[SuffixTree] Najdeni nizi:")
-    keywords.sort()
-    for pattern in keywords:
+    print(f"[{index_name}] Najdeni nizi:")
+    if args.queries:
+        # Paketno iskanje: rezultati prihajajo sproti, v vrstnem redu vzorcev v datoteki
         start_time = time.time()
-        result = suffixtree.search_approx(pattern, max_errors=k)
-        search_time += time.time() - start_time
-        print(f"'{pattern}' najden na indeksih: {result}")
-        # print(f"'{pattern}' najden {len(result)} krat")
-    print(f"[SuffixTree] Čas iskanja: {search_time*1000:.4f} ms")
-    print(f"[SuffixTree] Skupni čas: {(build_time + search_time)*1000:.4f} ms")
-
+        results = search_batch(suffixtree, read_patterns(args.queries), k, workers=args.workers,
+                               count_only=args.count)
+    else:
+        keywords.sort()
+        results = ((pattern, suffixtree.search_approx(pattern, max_errors=k, count_only=args.count))
+                   for pattern in keywords)
+        start_time = time.time()
+    for pattern, result in results:
+        if args.count:
+            print(f"'{pattern}' najden {result} krat")
+        else:
+            print(f"'{pattern}' najden na indeksih: {result}")
+    search_time = time.time() - start_time
+    print(f"[{index_name}] Čas iskanja: {search_time*1000:.4f} ms")
+    print(f"[{index_name}] Skupni čas: {(build_time + search_time)*1000:.4f} ms")
+    if args.stats:
+        print(f"[{index_name}] Opravljeno delo:")
+        print(STATS.report())
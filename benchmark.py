@@ -0,0 +1,391 @@
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import signal
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Skupne meritve za vse štiri vaje: generatorji vhodov z določenim semenom,
+# register primerov, merjenje časa in največje porabe pomnilnika ter primerjava
+# z izhodiščnimi rezultati (baseline).
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+_MODULES = {}
+
+
+def load_module(folder):
+    # Mape IAK-N* niso paketi, zato main.py naložimo po poti, vsakega pod svojim imenom
+    if folder not in _MODULES:
+        name = folder.lower().replace("-", "_")
+        spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, folder, "main.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+        _MODULES[folder] = module
+    return _MODULES[folder]
+
+
+# Generatorji podatkov
+
+def generate_dna(length, seed):
+    rng = random.Random(seed)
+    return "".join(rng.choice("ACGT") for _ in range(length))
+
+
+def generate_digest(points, seed, width=None):
+    # Multimnožica razdalj med points naključnimi točkami in krajiščema 0 in width
+    rng = random.Random(seed)
+    width = width or 10 * points
+    X = [0] + rng.sample(range(1, width), points) + [width]
+    return sorted(abs(a - b) for i, a in enumerate(X) for b in X[i + 1:])
+
+
+def generate_permutation(size, seed):
+    rng = random.Random(seed)
+    permutation = list(range(1, size + 1))
+    rng.shuffle(permutation)
+    return permutation
+
+
+def generate_patterns(count, length, seed):
+    rng = random.Random(seed)
+    return ["".join(rng.choice("ACGT") for _ in range(length)) for _ in range(count)]
+
+
+# Register primerov: funkcija primera dobi velikost in seme ter vrne funkcijo brez
+# argumentov, ki izvede en zagon algoritma (spremenljive vhode kopira sama).
+# Neobvezni check(rezultat, velikost) preveri rezultat prvega zagona, preden se
+# primer meri; primer z napačnim rezultatom se ne meri in šteje kot neuspešen.
+
+CASES = {}
+
+
+def case(name, sizes, check=None):
+    def register(make):
+        CASES[name] = (make, sizes, check)
+        return make
+    return register
+
+
+def _is_identity(result, size):
+    return result == list(range(1, size + 1))
+
+
+@case("N1.poisci_reze", sizes=(10_000, 100_000, 1_000_000))
+def _n1_poisci_reze(size, seed):
+    module = load_module("IAK-N1")
+    dna = generate_dna(size, seed)
+    return lambda: module.poisci_reze(dna, ["GAATTC", "GGATCC", "TTTT"])
+
+
+@case("N1.izracunaj_razdalje", sizes=(100, 300, 1000))
+def _n1_izracunaj_razdalje(size, seed):
+    module = load_module("IAK-N1")
+    cuts = sorted(random.Random(seed).sample(range(1, 100 * size), size))
+    return lambda: module.izracunaj_razdalje(cuts, 100 * size)
+
+
+@case("N1.brute_force", sizes=(5, 6, 7))
+def _n1_brute_force(size, seed):
+    module = load_module("IAK-N1")
+    L = generate_digest(size - 2, seed)
+    return lambda: module.brute_force(L)
+
+
+@case("N1.partial_digest", sizes=(8, 12, 16))
+def _n1_partial_digest(size, seed):
+    module = load_module("IAK-N1")
+    L = generate_digest(size - 2, seed)
+    return lambda: module.partial_digest(L.copy())
+
+
+@case("N2.simpleReversalSort", sizes=(100, 300, 1000), check=_is_identity)
+def _n2_simple(size, seed):
+    module = load_module("IAK-N2")
+    data = generate_permutation(size, seed)
+    return lambda: module.simpleReversalSort(data.copy())
+
+
+# Na naključnih permutacijah improvedBreakpointReversalSort pogosto obtiči (ni
+# padajočih ali naraščajočih trakov) ali se zacikla, zato meri genome iz vaje,
+# ki jih razvrsti. Velikost primera je dolžina genoma.
+GENOMES = {9: "G1.txt", 100: "G2.txt", 1000: "G3.txt"}
+
+
+def _n2_breakpoint(heuristic):
+    def make(size, seed):
+        module = load_module("IAK-N2")
+        data = module.readFileData(os.path.join(ROOT, "IAK-N2", GENOMES[size]))
+
+        def run():
+            random.seed(seed)  # hevristika 2 izbira naključno
+            return module.improvedBreakpointReversalSort(data.copy(), heuristic)
+        return run
+    return make
+
+
+for _heuristic in (1, 2, 3):
+    case(f"N2.improvedBreakpointReversalSort.h{_heuristic}", sizes=tuple(GENOMES),
+         check=_is_identity)(_n2_breakpoint(_heuristic))
+
+
+@case("N3.greedy", sizes=(2, 3, 4))
+def _n3_greedy(size, seed):
+    module = load_module("IAK-N3")
+    dna = generate_dna(8 * size, seed)
+    return lambda: module.recursive_greedy_motif_search(dna, 8, 3, size)
+
+
+@case("N3.bnb", sizes=(4, 5, 6))
+def _n3_bnb(size, seed):
+    module = load_module("IAK-N3")
+    dna = generate_dna(20 * 5, seed)
+    return lambda: module.branch_and_bound_motif_search(dna, 20, size, 5)
+
+
+@case("N3.median", sizes=(4, 5, 6))
+def _n3_median(size, seed):
+    module = load_module("IAK-N3")
+    dna = generate_dna(20 * 5, seed)
+    return lambda: module.median_string_motif_search(dna, 20, size, 5)
+
+
+@case("N3.randomized", sizes=(5, 10, 20))
+def _n3_randomized(size, seed):
+    module = load_module("IAK-N3")
+    dna = generate_dna(100 * size, seed)
+    return lambda: module.randomized_motif_search(dna, 100, 8, size, restarts=10, seed=seed, workers=1)
+
+
+@case("N3.gibbs", sizes=(5, 10, 20))
+def _n3_gibbs(size, seed):
+    module = load_module("IAK-N3")
+    dna = generate_dna(100 * size, seed)
+    return lambda: module.gibbs_sampler_motif_search(dna, 100, 8, size, restarts=10, seed=seed, workers=1)
+
+
+def _n4_keyword_tree(max_k, edit_distance):
+    def make(size, seed):
+        module = load_module("IAK-N4")
+        text = generate_dna(size, seed)
+        keywords = generate_patterns(10, 8, seed + 1)
+
+        def run():
+            tree = module.KeywordTree()
+            tree.build_tree(keywords)
+            return tree.search_all(text, max_k=max_k, edit_distance=edit_distance)
+        return run
+    return make
+
+
+case("N4.KeywordTree.exact", sizes=(10_000, 100_000, 1_000_000))(_n4_keyword_tree(0, False))
+case("N4.KeywordTree.mismatch", sizes=(10_000, 100_000))(_n4_keyword_tree(1, False))
+case("N4.KeywordTree.edit", sizes=(10_000, 100_000))(_n4_keyword_tree(1, True))
+
+
+def _n4_index_build(class_name):
+    def make(size, seed):
+        index_class = getattr(load_module("IAK-N4"), class_name)
+        text = generate_dna(size, seed)
+        return lambda: index_class(text)
+    return make
+
+
+def _n4_index_search(class_name):
+    def make(size, seed):
+        index = getattr(load_module("IAK-N4"), class_name)(generate_dna(size, seed))
+        patterns = generate_patterns(20, 8, seed + 1)
+        return lambda: [index.search_approx(pattern, max_errors=1) for pattern in patterns]
+    return make
+
+
+for _class_name in ("SuffixTree", "SuffixArray"):
+    case(f"N4.{_class_name}.build", sizes=(10_000, 100_000))(_n4_index_build(_class_name))
+    case(f"N4.{_class_name}.search_approx", sizes=(10_000, 100_000))(_n4_index_search(_class_name))
+
+
+# Merjenje
+
+def measure(run, repeat=5, warmup=1, min_time=0.05):
+    # Čas enega zagona je mediana in minimum repeat vzorcev. Vsak vzorec zažene
+    # funkcijo number krat, kjer je number umerjen tako, da vzorec traja vsaj min_time.
+    for _ in range(warmup):
+        run()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        times.append((time.perf_counter() - start) / number)
+
+    # Pomnilnik v ločenem zagonu, ker tracemalloc upočasni izvajanje
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {"median": statistics.median(times), "min": min(times), "number": number,
+            "repeat": repeat, "peak_bytes": peak}
+
+
+def select_cases(filters=(), quick=False):
+    # (ime primera z velikostjo, funkcija primera, velikost)
+    selected = []
+    for name, (make, sizes, check) in CASES.items():
+        if filters and not any(pattern in name for pattern in filters):
+            continue
+        for size in sizes[:1] if quick else sizes:
+            selected.append((f"{name}[{size}]", make, size, check))
+    return selected
+
+
+class CaseTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise CaseTimeout()
+
+
+def first_run(run, time_limit):
+    # Prvi zagon s časovno omejitvijo (SIGALRM, kjer obstaja), da zacikljen primer
+    # ne ustavi celotnih meritev. Vrne rezultat zagona.
+    if not time_limit or not hasattr(signal, "SIGALRM"):
+        return run()
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, time_limit)
+    try:
+        return run()
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def count_work(run):
+    # Števci opravljenega dela (Stats v vsaki vaji) za en zagon, brez merjenja časa
+    modules = [module for module in _MODULES.values() if hasattr(module, "STATS")]
+    for module in modules:
+        module.STATS.reset()
+        module.STATS.enabled = True
+    try:
+        run()
+    finally:
+        for module in modules:
+            module.STATS.enabled = False
+    work = {}
+    for module in modules:
+        work.update(module.STATS.counters)
+        module.STATS.reset()
+    return work
+
+
+def run_benchmarks(filters=(), quick=False, repeat=5, warmup=1, seed=0, time_limit=60):
+    results = {"meta": {"python": platform.python_version(), "platform": platform.platform(),
+                        "seed": seed, "repeat": repeat, "warmup": warmup,
+                        "date": time.strftime("%Y-%m-%dT%H:%M:%S")},
+               "cases": {}}
+    for key, make, size, check in select_cases(filters, quick):
+        # Algoritmi iz vaj izpisujejo vmesne rezultate, ki jih tu ne potrebujemo
+        with contextlib.redirect_stdout(io.StringIO()):
+            run = make(size, seed)
+            try:
+                error = None if check is None or check(first_run(run, time_limit), size) \
+                    else "napačen rezultat"
+            except CaseTimeout:
+                error = f"prvi zagon traja več kot {time_limit} s"
+            if error is None:
+                result = measure(run, repeat=repeat, warmup=warmup)
+                result["work"] = count_work(run)
+        if error is not None:
+            results["cases"][key] = {"error": error}
+            print(f"{key:<50} NAPAKA: {error}")
+            continue
+        results["cases"][key] = result
+        print(f"{key:<50} {result['median'] * 1000:>12.4f} ms {result['peak_bytes'] / 1024:>12.1f} KiB")
+    return results
+
+
+def compare(results, baseline, threshold=1.25):
+    # Vrne seznam primerov, ki so počasnejši od izhodišča za več kot faktor threshold
+    # (primerja se najmanjši čas, ki je najmanj občutljiv na šum)
+    regressions = []
+    print(f"\n{'Primer':<50} {'Izhodišče':>12} {'Zdaj':>12} {'Razmerje':>9}")
+    for key, result in results["cases"].items():
+        reference = baseline.get("cases", {}).get(key)
+        if "error" in result:
+            continue
+        if reference is None or "error" in reference:
+            print(f"{key:<50} {'-':>12} {result['min'] * 1000:>9.4f} ms {'nov':>9}")
+            continue
+        ratio = result["min"] / reference["min"] if reference["min"] > 0 else float("inf")
+        mark = " !" if ratio > threshold else ""
+        print(f"{key:<50} {reference['min'] * 1000:>9.4f} ms {result['min'] * 1000:>9.4f} ms {ratio:>8.2f}x{mark}")
+        if ratio > threshold:
+            regressions.append((key, ratio))
+        # Sprememba opravljenega dela pokaže učinek rezanja ali indeksa neodvisno od šuma
+        for name in sorted(set(result.get("work", {})) | set(reference.get("work", {}))):
+            before, after = reference.get("work", {}).get(name, 0), result.get("work", {}).get(name, 0)
+            if before != after:
+                print(f"    {name}: {before} -> {after}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Meritve časa in pomnilnika za algoritme vseh vaj.")
+    parser.add_argument("filters", nargs="*", help="Izvedi le primere, katerih ime vsebuje enega od nizov")
+    parser.add_argument("--list", action="store_true", help="Izpiši registrirane primere in končaj")
+    parser.add_argument("--quick", action="store_true", help="Le najmanjša velikost vsakega primera")
+    parser.add_argument("--repeat", type=int, default=5, help="Število merjenih vzorcev")
+    parser.add_argument("--warmup", type=int, default=1, help="Število zagonov pred merjenjem")
+    parser.add_argument("--seed", type=int, default=0, help="Seme generatorjev podatkov")
+    parser.add_argument("--output", type=str, default="benchmark_results.json",
+                        help="Datoteka JSON z rezultati (lahko služi kot izhodišče za naslednje primerjave)")
+    parser.add_argument("--baseline", type=str, default=None, help="Izhodiščni rezultati za primerjavo")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Največje dovoljeno razmerje med novim in izhodiščnim časom")
+    parser.add_argument("--time-limit", type=float, default=60,
+                        help="Največji čas prvega zagona primera v sekundah (0 brez omejitve)")
+    args = parser.parse_args()
+
+    if args.list:
+        for key, *_ in select_cases(args.filters, args.quick):
+            print(key)
+        sys.exit(0)
+
+    results = run_benchmarks(args.filters, args.quick, args.repeat, args.warmup, args.seed, args.time_limit)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=1, sort_keys=True)
+    print(f"Rezultati shranjeni v {args.output}")
+    failed = [key for key, result in results["cases"].items() if "error" in result]
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("seed") != args.seed:
+            print("Opozorilo: izhodišče je bilo izmerjeno z drugim semenom")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nPočasnejši od izhodišča za več kot {args.threshold}x: {', '.join(key for key, _ in regressions)}")
+            sys.exit(1)
+    if failed:
+        print(f"\nNeuspešni primeri: {', '.join(failed)}")
+        sys.exit(1)
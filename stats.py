@@ -0,0 +1,62 @@
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+# Števci opravljenega dela in časi faz, skupni vsem vajam. Vsaka vaja ima svoj
+# objekt STATS = Stats() in ta modul uvozi, potem ko doda koren repozitorija v
+# sys.path (mape IAK-N* niso paketi).
+# Privzeto je izklopljeno: algoritmi štejejo v lokalne spremenljivke in jih
+# prištejejo enkrat na klic, izklopljena faza pa je le prazen kontekst.
+
+
+class Stats:
+    def __init__(self):
+        self.enabled = False
+        self.counters = {}
+        self.timers = {}
+
+    def reset(self):
+        self.counters.clear()
+        self.timers.clear()
+
+    def add(self, name, value=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def phase(self, name):
+        return self._phase(name) if self.enabled else nullcontext()
+
+    @contextmanager
+    def _phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timers[name] = self.timers.get(name, 0.0) + time.perf_counter() - start
+
+    def timed(self, name):
+        # Dekorator za funkcije z več izhodi, ki jih ni smiselno zaviti v with
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with self._phase(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def as_dict(self):
+        return {"counters": dict(self.counters), "timers": dict(self.timers)}
+
+    def merge(self, data):
+        # Prišteje števce in čase, ki jih je vrnil delavski proces (as_dict)
+        for name, value in data["counters"].items():
+            self.counters[name] = self.counters.get(name, 0) + value
+        for name, seconds in data["timers"].items():
+            self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+    def report(self, phase_label="faza"):
+        lines = [f"  {name}: {value}" for name, value in sorted(self.counters.items())]
+        lines += [f"  {phase_label} {name}: {seconds * 1000:.4f} ms" for name, seconds in sorted(self.timers.items())]
+        return "\n".join(lines)